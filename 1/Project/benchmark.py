@@ -0,0 +1,205 @@
+"""Benchmark and verify the SimpleEncryption ciphers across message sizes
+
+Times caesar_encrypt, substitution_encrypt, reverse_encrypt and
+multi_encrypt on messages from 16 bytes up to 1 GB, recording MB/s,
+per-call latency and peak traced memory, and checks that decrypting each
+output gives the original back. Results are written as JSON; pass
+--compare with an older results file to flag regressions (and any failed
+round trip).
+
+    python benchmark.py --out results.json
+    python benchmark.py --sizes 16 1K 1M --compare results.json
+    python benchmark.py --sizes 1G --methods caesar multi --bytes
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from encryptndecrypt import SimpleEncryption
+
+DEFAULT_SIZES = [16, 256, 4 << 10, 64 << 10, 1 << 20, 16 << 20, 256 << 20]
+
+# Method name -> (encrypt method name, decrypt method name)
+METHODS = {
+    'caesar': ('caesar_encrypt', 'caesar_decrypt'),
+    'substitution': ('substitution_encrypt', 'substitution_decrypt'),
+    'reverse': ('reverse_encrypt', 'reverse_decrypt'),
+    'multi': ('multi_encrypt', 'multi_decrypt'),
+}
+
+# Small messages are timed over enough calls to cover about this many bytes
+BATCH_BYTES = 4 << 20
+
+
+def parse_size(text):
+    """Parse '16', '4K', '1M' or '1G' into bytes"""
+    text = text.upper()
+    scale = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}.get(text[-1:], 1)
+    return int(text[:-1] if scale > 1 else text) * scale
+
+
+def format_size(size):
+    for unit, scale in (('G', 1 << 30), ('M', 1 << 20), ('K', 1 << 10)):
+        if size >= scale and size % scale == 0:
+            return f"{size // scale}{unit}"
+    return str(size)
+
+
+def make_message(crypto, size, seed=0, binary=False):
+    """size characters drawn from crypto.chars (64 KB of random text, repeated)"""
+    rng = random.Random(seed)
+    block = ''.join(rng.choices(crypto.chars, k=min(size, 64 << 10)))
+    message = (block * (size // len(block) + 1))[:size] if block else ''
+    return message.encode('latin-1') if binary else message
+
+
+def call_args(method, key):
+    """Extra arguments after the message for a method"""
+    if method == 'substitution':
+        return (key,)
+    if method in ('caesar', 'multi'):
+        return (3,)
+    return ()
+
+
+def measure(func, calls=1, repeat=1):
+    """Time `calls` calls of func (fastest of `repeat` untraced runs), then trace one call
+
+    tracemalloc slows allocation-heavy code, so timings never come from the
+    traced run. Returns (seconds per call, peak traced bytes).
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best / calls, peak
+
+
+def benchmark_size(size, methods=tuple(METHODS), seed=0, repeat=1, binary=False):
+    crypto = SimpleEncryption()
+    random.seed(seed)
+    key = crypto.create_simple_key()
+    message = make_message(crypto, size, seed, binary)
+    calls = max(1, min(100000, BATCH_BYTES // max(1, size)))
+
+    entry = {}
+    for method in methods:
+        encrypt_name, decrypt_name = METHODS[method]
+        encrypt = getattr(crypto, encrypt_name)
+        decrypt = getattr(crypto, decrypt_name)
+        args = call_args(method, key)
+
+        encrypted = encrypt(message, *args)
+        ok = decrypt(encrypted, *args) == message
+        del encrypted
+
+        seconds, peak = measure(lambda: encrypt(message, *args), calls, repeat)
+        entry[method] = {
+            'ok': ok,
+            'time': seconds,
+            'mb_per_second': size / seconds / 1e6 if seconds else 0.0,
+            'peak_bytes': peak,
+            'calls': calls,
+        }
+    return entry
+
+
+def run(sizes, methods=tuple(METHODS), seed=0, repeat=1, binary=False, verbose=True):
+    results = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': seed,
+        'binary': binary,
+        'sizes': {},
+    }
+    for size in sizes:
+        entry = benchmark_size(size, methods, seed=seed, repeat=repeat, binary=binary)
+        results['sizes'][str(size)] = entry
+        if verbose:
+            print(f"{format_size(size)}:")
+            for name, stats in entry.items():
+                print(f"  {name:13s} {'✓' if stats['ok'] else '✗ ROUND TRIP FAILED'} "
+                      f"{stats['time'] * 1e6:12.2f} µs/call "
+                      f"{stats['mb_per_second']:9.1f} MB/s "
+                      f"{stats['peak_bytes'] / 1e6:9.1f} MB peak")
+    return results
+
+
+def compare(current, baseline, threshold=0.10):
+    """List regressions: failed round trips, or time / peak memory worse by > threshold"""
+    regressions = []
+    for size, entry in current['sizes'].items():
+        old_entry = baseline.get('sizes', {}).get(size, {})
+        for name, stats in entry.items():
+            if not stats['ok']:
+                regressions.append({'size': size, 'benchmark': name, 'metric': 'ok',
+                                    'baseline': True, 'current': False, 'change': 0.0})
+            old = old_entry.get(name)
+            if not old:
+                continue
+            for metric in ('time', 'peak_bytes'):
+                if old[metric] and stats[metric] > old[metric] * (1 + threshold):
+                    regressions.append({
+                        'size': size,
+                        'benchmark': name,
+                        'metric': metric,
+                        'baseline': old[metric],
+                        'current': stats[metric],
+                        'change': stats[metric] / old[metric] - 1,
+                    })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=parse_size, nargs='+', default=DEFAULT_SIZES,
+                        help="message sizes, e.g. 16 4K 1M 1G")
+    parser.add_argument('--methods', nargs='+', choices=list(METHODS), default=list(METHODS))
+    parser.add_argument('--bytes', action='store_true',
+                        help="encrypt bytes instead of str messages")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="timed runs per benchmark, the fastest is kept")
+    parser.add_argument('--out', help="write results JSON here")
+    parser.add_argument('--compare', help="baseline results JSON to check against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="allowed slowdown before flagging (default 0.10)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.methods, seed=args.seed, repeat=args.repeat,
+                  binary=args.bytes)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    failed = [(size, name) for size, entry in results['sizes'].items()
+              for name, stats in entry.items() if not stats['ok']]
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['size']} {r['benchmark']} {r['metric']}: "
+                  f"{r['baseline']:.4g} -> {r['current']:.4g} ({r['change']:+.0%})")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,373 @@
+"""Recover keys for SimpleEncryption's Caesar and substitution ciphers
+
+Both attacks score candidate plaintexts with a bigram model of English over
+the cipher alphabet (SimpleEncryption().chars, plus one symbol for every
+other character). The ciphertext's unigram and bigram counts are taken once;
+after that no candidate ever touches the text again.
+
+- Caesar: each of the len(chars) shifts is scored from the counts alone.
+- Substitution: hill climbing over key swaps. A swap only changes the
+  bigrams that contain one of the two swapped symbols, so its score change
+  is summed over those counts, not the whole text. Restarts run on a
+  process pool and the best key wins.
+
+The default model is trained on half of the English documentation bundled
+with Python (pydoc_data); the benchmark decrypts slices of the other half.
+
+    python cryptanalysis.py caesar cipher.txt
+    python cryptanalysis.py substitution cipher.txt --restarts 8 --key-out key.json
+    python cryptanalysis.py bench --lengths 500 2000 --trials 5 --out results.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from encryptndecrypt import CipherKey, SimpleEncryption, save_key
+
+
+@lru_cache(maxsize=8)
+def _symbol_tables(chars):
+    """(str table, bytes table) turning text into symbol codes for chars
+
+    Alphabet characters go to chr(128 + i) first, and any other character
+    already in that range goes to chr(255), so nothing else can land on a
+    code; the bytes table then folds them to i and everything else to
+    len(chars).
+    """
+    other = len(chars)
+    if other > 127:
+        raise ValueError("alphabets of more than 127 characters are not supported")
+    mapping = {chr(code): chr(255) for code in range(128, 128 + other)}
+    mapping.update({c: chr(128 + i) for i, c in enumerate(chars)})
+    to_high = str.maketrans(mapping)
+    fold = bytes(i - 128 if 128 <= i < 128 + other else other for i in range(256))
+    # Every Latin-1 character outside the alphabet must come out as "other"
+    for code in range(256):
+        char = chr(code)
+        assert char in chars or fold[ord(char.translate(to_high))] == other, char
+    return to_high, fold
+
+
+def encode_symbols(text, chars):
+    """text as bytes of symbol codes: index in chars, or len(chars) for anything else"""
+    to_high, fold = _symbol_tables(chars)
+    return text.translate(to_high).encode('latin-1', 'replace').translate(fold)
+
+
+def count_ngrams(symbols, size):
+    """(unigram counts list, {(a, b): count}) for encoded symbols"""
+    unigrams = [symbols.count(i) for i in range(size)]
+    bigrams = Counter(zip(symbols, symbols[1:]))
+    return unigrams, bigrams
+
+
+def training_text(part=0):
+    """Half of Python's bundled documentation (part 0 or 1), whitespace folded"""
+    try:
+        from pydoc_data.topics import topics
+    except ImportError:
+        raise RuntimeError("pydoc_data is missing from this Python; "
+                           "train a LanguageModel from your own text") from None
+    names = sorted(topics)[part::2]
+    return re.sub(r'\s+', ' ', ' '.join(topics[name] for name in names))
+
+
+class LanguageModel:
+    """Log-probability unigram and bigram tables over an alphabet
+
+    Symbols are the alphabet's indices plus len(chars) for any other
+    character. bigram is flat: bigram[a * size + b]. Unseen n-grams get
+    add-`smoothing` counts so no score is -inf.
+    """
+
+    def __init__(self, text, chars=None, smoothing=0.5):
+        self.chars = chars or SimpleEncryption().chars
+        self.size = size = len(self.chars) + 1
+        unigrams, bigrams = count_ngrams(encode_symbols(text, self.chars), size)
+
+        total = sum(unigrams) + smoothing * size
+        self.unigram = [math.log((count + smoothing) / total) for count in unigrams]
+        total = sum(bigrams.values()) + smoothing * size * size
+        self.bigram = [math.log(smoothing / total)] * (size * size)
+        for (a, b), count in bigrams.items():
+            self.bigram[a * size + b] = math.log((count + smoothing) / total)
+
+    @classmethod
+    def from_file(cls, filename, chars=None, smoothing=0.5):
+        with open(filename, encoding='utf-8', errors='replace') as f:
+            return cls(f.read(), chars, smoothing)
+
+
+@lru_cache(maxsize=1)
+def default_model():
+    """LanguageModel for the default alphabet, trained once on training_text(0)"""
+    return LanguageModel(training_text(0))
+
+
+# === CAESAR ===
+def score_caesar(ciphertext, model=None):
+    """[(score, shift)] for every shift, best first
+
+    caesar_decrypt(ciphertext, shift) is the candidate plaintext. The text
+    is counted once; each shift only relabels those counts.
+    """
+    model = model or default_model()
+    size, n = model.size, model.size - 1
+    unigrams, bigrams = count_ngrams(encode_symbols(ciphertext, model.chars), size)
+    unigrams = [(a, count) for a, count in enumerate(unigrams) if count]
+    bigrams = list(bigrams.items())
+    unigram, bigram = model.unigram, model.bigram
+
+    scores = []
+    for shift in range(n):
+        plain = [(c - shift) % n for c in range(n)] + [n]
+        score = sum(count * unigram[plain[a]] for a, count in unigrams)
+        score += sum(count * bigram[plain[a] * size + plain[b]] for (a, b), count in bigrams)
+        scores.append((score, shift))
+    scores.sort(reverse=True)
+    return scores
+
+
+def break_caesar(ciphertext, model=None):
+    """Return (shift, plaintext) for the most English-looking shift"""
+    model = model or default_model()
+    _, shift = score_caesar(ciphertext, model)[0]
+    crypto = SimpleEncryption()
+    crypto.chars = model.chars
+    return shift, crypto.caesar_decrypt(ciphertext, shift)
+
+
+# === SUBSTITUTION ===
+def _climb(task):
+    """Hill-climb one restart in a worker; return (score, plain symbol per cipher symbol)
+
+    Sweeps every (present symbol, any symbol) swap in random order and
+    keeps improvements, until a whole sweep finds none.
+    """
+    rows, cols, unigrams, bigram, unigram, size, plain, seed, shuffle = task
+    n = size - 1
+    rng = random.Random(seed)
+    plain = list(plain)
+    present = [a for a in range(n) if unigrams[a]]
+    for _ in range(shuffle):
+        x, y = rng.choice(present), rng.randrange(n)
+        plain[x], plain[y] = plain[y], plain[x]
+
+    def partial(x, y):
+        # Every score term with x or y in it, each counted once
+        px, py = plain[x], plain[y]
+        total = unigrams[x] * unigram[px] + unigrams[y] * unigram[py]
+        row = px * size
+        for b, count in rows[x]:
+            total += count * bigram[row + plain[b]]
+        row = py * size
+        for b, count in rows[y]:
+            total += count * bigram[row + plain[b]]
+        for a, count in cols[x]:
+            if a != x and a != y:
+                total += count * bigram[plain[a] * size + px]
+        for a, count in cols[y]:
+            if a != x and a != y:
+                total += count * bigram[plain[a] * size + py]
+        return total
+
+    pairs = [(x, y) for x in present for y in range(n) if x != y]
+    improved = True
+    while improved:
+        improved = False
+        rng.shuffle(pairs)
+        for x, y in pairs:
+            before = partial(x, y)
+            plain[x], plain[y] = plain[y], plain[x]
+            if partial(x, y) > before + 1e-9:
+                improved = True
+            else:
+                plain[x], plain[y] = plain[y], plain[x]
+
+    score = sum(count * unigram[plain[a]] for a, count in enumerate(unigrams))
+    score += sum(count * bigram[plain[a] * size + plain[b]]
+                 for a in range(size) for b, count in rows[a])
+    return score, plain
+
+
+def break_substitution(ciphertext, model=None, restarts=4, workers=None, seed=0):
+    """Return (CipherKey, plaintext) for the best of `restarts` hill climbs
+
+    The key is in create_simple_key's direction (plain -> cipher), so
+    substitution_decrypt(ciphertext, key) gives the plaintext. Restart 0
+    starts from frequency order; the others shuffle it a little first.
+    workers defaults to all cores; 1 runs in this process.
+    """
+    model = model or default_model()
+    size, n = model.size, model.size - 1
+    unigrams, bigrams = count_ngrams(encode_symbols(ciphertext, model.chars), size)
+    rows = [[] for _ in range(size)]
+    cols = [[] for _ in range(size)]
+    for (a, b), count in bigrams.items():
+        rows[a].append((b, count))
+        cols[b].append((a, count))
+
+    # Most frequent cipher symbol gets the most frequent plain symbol, and so on
+    by_count = sorted(range(n), key=lambda a: -unigrams[a])
+    by_model = sorted(range(n), key=lambda p: -model.unigram[p])
+    plain = [0] * size
+    for a, p in zip(by_count, by_model):
+        plain[a] = p
+    plain[n] = n
+
+    tasks = [(rows, cols, unigrams, model.bigram, model.unigram, size, plain,
+              f"{seed}:{i}", 0 if i == 0 else n // 4) for i in range(restarts)]
+    if workers == 1 or len(tasks) <= 1:
+        results = [_climb(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_climb, tasks))
+    _, plain = max(results, key=lambda result: result[0])
+
+    chars = model.chars
+    key = CipherKey({chars[plain[c]]: chars[c] for c in range(n)})
+    return key, key.decrypt(ciphertext)
+
+
+# === BENCHMARK ===
+def benchmark(text, model=None, lengths=(500, 2000), trials=5, restarts=4,
+              workers=None, seed=0, threshold=0.98, verbose=True):
+    """Encrypt random slices of known text, break them, count recovered keys
+
+    A Caesar key counts as recovered when the decryption equals the
+    plaintext. Rare symbols (digits, some capitals) in a short text can't
+    be told apart by their statistics, so a substitution key counts once
+    `threshold` of the characters come out right; exact matches are
+    reported separately.
+    """
+    model = model or default_model()
+    crypto = SimpleEncryption()
+    crypto.chars = model.chars
+    rng = random.Random(seed)
+    results = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': seed,
+        'restarts': restarts,
+        'threshold': threshold,
+        'lengths': {},
+    }
+    for length in lengths:
+        samples = []
+        for _ in range(trials):
+            start = rng.randrange(max(1, len(text) - length))
+            samples.append(text[start:start + length])
+
+        recovered = 0
+        start = time.perf_counter()
+        for plaintext in samples:
+            ciphertext = crypto.caesar_encrypt(plaintext, rng.randrange(1, len(model.chars)))
+            recovered += break_caesar(ciphertext, model)[1] == plaintext
+        elapsed = time.perf_counter() - start
+        caesar = {
+            'trials': trials,
+            'recovered': recovered,
+            'time': elapsed,
+            'keys_per_second': recovered / elapsed if elapsed else 0.0,
+        }
+
+        recovered, exact, correct = 0, 0, 0
+        start = time.perf_counter()
+        for i, plaintext in enumerate(samples):
+            ciphertext = crypto.create_key().encrypt(plaintext)
+            _, guess = break_substitution(ciphertext, model, restarts=restarts,
+                                          workers=workers, seed=f"{seed}:{length}:{i}")
+            right = sum(a == b for a, b in zip(guess, plaintext))
+            recovered += right >= threshold * len(plaintext)
+            exact += guess == plaintext
+            correct += right
+        elapsed = time.perf_counter() - start
+        substitution = {
+            'trials': trials,
+            'recovered': recovered,
+            'exact': exact,
+            'character_accuracy': correct / max(1, sum(map(len, samples))),
+            'time': elapsed,
+            'keys_per_second': recovered / elapsed if elapsed else 0.0,
+        }
+
+        results['lengths'][str(length)] = {'caesar': caesar, 'substitution': substitution}
+        if verbose:
+            print(f"{length} characters:")
+            print(f"  caesar       {caesar['recovered']}/{trials} recovered, "
+                  f"{caesar['time'] / trials * 1000:8.1f} ms each, "
+                  f"{caesar['keys_per_second']:8.1f} keys/s")
+            print(f"  substitution {substitution['recovered']}/{trials} recovered "
+                  f"({substitution['exact']} exact, "
+                  f"{substitution['character_accuracy']:.1%} characters), "
+                  f"{substitution['time'] / trials * 1000:8.1f} ms each, "
+                  f"{substitution['keys_per_second']:8.2f} keys/s")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name in ('caesar', 'substitution'):
+        command = sub.add_parser(name, help=f"break a {name} ciphertext")
+        command.add_argument('source', help="ciphertext file, or - for stdin")
+    sub.choices['substitution'].add_argument('--restarts', type=int, default=4)
+    sub.choices['substitution'].add_argument('--key-out', help="save the recovered key here")
+    bench = sub.add_parser('bench', help="break known ciphertexts and report keys per second")
+    bench.add_argument('--corpus', help="plaintext file (default: held-out Python docs)")
+    bench.add_argument('--lengths', type=int, nargs='+', default=[500, 2000])
+    bench.add_argument('--trials', type=int, default=5)
+    bench.add_argument('--restarts', type=int, default=4)
+    bench.add_argument('--seed', type=int, default=0)
+    bench.add_argument('--threshold', type=float, default=0.98,
+                       help="fraction of characters right to count a substitution key")
+    bench.add_argument('--out', help="write results JSON here")
+    for command in sub.choices.values():
+        command.add_argument('--train', help="English text to train the model on")
+        command.add_argument('--workers', type=int, default=None,
+                             help="worker processes for restarts (default: all cores)")
+    args = parser.parse_args(argv)
+
+    model = LanguageModel.from_file(args.train) if args.train else default_model()
+    if args.command == 'bench':
+        if args.corpus:
+            with open(args.corpus, encoding='utf-8', errors='replace') as f:
+                text = f.read()
+        else:
+            text = training_text(1)
+        results = benchmark(text, model, lengths=args.lengths, trials=args.trials,
+                            restarts=args.restarts, workers=args.workers, seed=args.seed,
+                            threshold=args.threshold)
+        if args.out:
+            with open(args.out, 'w') as f:
+                json.dump(results, f, indent=2)
+        return 0
+
+    if args.source == '-':
+        ciphertext = sys.stdin.read()
+    else:
+        with open(args.source, encoding='utf-8') as f:
+            ciphertext = f.read()
+    if args.command == 'caesar':
+        shift, plaintext = break_caesar(ciphertext, model)
+        print(f"shift {shift}", file=sys.stderr)
+    else:
+        key, plaintext = break_substitution(ciphertext, model, restarts=args.restarts,
+                                            workers=args.workers)
+        if args.key_out:
+            save_key(key, args.key_out)
+    sys.stdout.write(plaintext)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,74 @@
+import argparse
+import bisect
+import json
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+from array import array
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# Bytes read (or mmap'd) at a time by the streaming file functions
+CHUNK_SIZE = 1 << 20
+
+# Bytes handed to one worker task by bulk_encrypt and encrypt_batch
+BULK_CHUNK_SIZE = 8 << 20
+
+STREAM_METHODS = ('caesar', 'substitution', 'reverse', 'multi')
+
+
 class SimpleEncryption:
     def __init__(self):
         self.chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789 !@#$%^&*(),.?;:"
+        # Translation tables built so far, per (alphabet, shift or key, type)
+        self._tables = {}
     
-    def caesar_encrypt(self, message, shift=3):
-        result = ""
-        for char in message:
-            if char in self.chars:
-                old_pos = self.chars.find(char)
-                new_pos = (old_pos + shift) % len(self.chars)
-                result += self.chars[new_pos]
+    def _caesar_table(self, shift, binary=False):
+        """str.translate (or bytes.translate) table for a shift, built once"""
+        chars = self.chars
+        cache_key = ('caesar', chars, shift % len(chars), binary)
+        table = self._tables.get(cache_key)
+        if table is None:
+            shift %= len(chars)
+            shifted = chars[shift:] + chars[:shift]
+            if binary:
+                # Bytes can only hold characters 0-255; the rest never match
+                pairs = [(a, b) for a, b in zip(chars, shifted) if ord(a) < 256 and ord(b) < 256]
+                table = bytes.maketrans(''.join(a for a, _ in pairs).encode('latin-1'),
+                                        ''.join(b for _, b in pairs).encode('latin-1'))
             else:
-                result += char  
-        return result
+                table = str.maketrans(chars, shifted)
+            table = self._remember(cache_key, table)
+        return table
+    
+    def _substitution_table(self, key, binary=False, reverse=False):
+        """Translation table for a substitution key (or its inverse), built once per key"""
+        if isinstance(key, CipherKey):
+            return key.table(binary, reverse)
+        cache_key = ('substitution', tuple(key.items()), binary, reverse)
+        table = self._tables.get(cache_key)
+        if table is None:
+            table = self._remember(cache_key, _key_table(key, binary, reverse))
+        return table
+    
+    def _remember(self, cache_key, table):
+        # Keys are often made fresh per message; don't let the cache grow forever
+        if len(self._tables) >= 1024:
+            self._tables.clear()
+        self._tables[cache_key] = table
+        return table
+    
+    def caesar_encrypt(self, message, shift=3):
+        """Shift every character of self.chars, leave anything else as is
+        
+        Works on str, or on bytes/bytearray (characters as Latin-1 bytes).
+        """
+        if isinstance(message, (bytes, bytearray)):
+            return message.translate(self._caesar_table(shift, binary=True))
+        return message.translate(self._caesar_table(shift))
     
     def caesar_decrypt(self, encrypted_message, shift=3):
         return self.caesar_encrypt(encrypted_message, -shift)
@@ -27,26 +84,249 @@ class SimpleEncryption:
             key[chars_list[i]] = mixed_chars[i]
         return key
     
+    def create_key(self):
+        """A random substitution key as a CipherKey, with its tables ready"""
+        return CipherKey(self.create_simple_key())
+    
     def substitution_encrypt(self, message, key):
-        result = ""
-        for char in message:
-            if char in key:
-                result += key[char]
-            else:
-                result += char
-        return result
+        """Replace every character found in key, leave anything else as is"""
+        if isinstance(message, (bytes, bytearray)):
+            return message.translate(self._substitution_table(key, binary=True))
+        return message.translate(self._substitution_table(key))
     
     def substitution_decrypt(self, encrypted_message, key):
         """Reverse the substitution"""
         # Flip the key: mixed -> original
-        reverse_key = {v: k for k, v in key.items()}
-        result = ""
-        for char in encrypted_message:
-            if char in reverse_key:
-                result += reverse_key[char]
+        binary = isinstance(encrypted_message, (bytes, bytearray))
+        return encrypted_message.translate(
+            self._substitution_table(key, binary=binary, reverse=True))
+    
+    # === PIPELINES (any stack of layers, compiled to one pass) ===
+    def compile(self, layers, decrypt=False):
+        """Compile layers into a CipherPlan, built once per layer stack
+        
+        layers is a sequence of ('caesar', shift), ('substitution', key) and
+        'reverse' (or ('reverse',)), applied in order. With decrypt the plan
+        undoes them instead.
+        """
+        layers = tuple(self._layer_spec(layer) for layer in layers)
+        cache_key = ('plan', self.chars, layers, decrypt)
+        plan = self._tables.get(cache_key)
+        if plan is None:
+            if decrypt:
+                layers = tuple(_inverse_layer(layer) for layer in reversed(layers))
+            plan = self._remember(cache_key, CipherPlan(layers))
+        return plan
+    
+    def pipeline_encrypt(self, message, layers):
+        """Run layers over message in one pass; str or bytes like the single ciphers"""
+        return self.compile(layers).apply(message)
+    
+    def pipeline_decrypt(self, encrypted_message, layers):
+        """Undo pipeline_encrypt with the same layers"""
+        return self.compile(layers, decrypt=True).apply(encrypted_message)
+    
+    def _layer_spec(self, layer):
+        """Hashable ('caesar', chars, shift), ('substitution', key items) or ('reverse',)"""
+        if isinstance(layer, str):
+            layer = (layer,)
+        name, *args = layer
+        if name == 'reverse' and not args:
+            return ('reverse',)
+        if name == 'caesar' and len(args) == 1:
+            return ('caesar', self.chars, args[0] % len(self.chars))
+        if name == 'substitution' and len(args) == 1:
+            key = args[0]
+            return ('substitution', key.pairs if isinstance(key, CipherKey) else tuple(key.items()))
+        raise ValueError(f"unknown layer {layer!r}, use ('caesar', shift), "
+                         f"('substitution', key) or 'reverse'")
+    
+    def _method_plan(self, method, shift, key, decrypt):
+        """Return (str table, bytes table, ASCII only?, reversed?) doing a method in one pass
+        
+        The bytes table is None when the key doesn't fit in bytes; ASCII
+        only means it is also right for UTF-8 bytes.
+        """
+        if method == 'caesar':
+            layers = [('caesar', shift)]
+        elif method == 'multi':
+            layers = [('caesar', shift), 'reverse', ('caesar', shift + 2)]
+        elif method == 'reverse':
+            layers = ['reverse']
+        elif method == 'substitution':
+            if key is None:
+                raise ValueError("substitution needs a key")
+            layers = [('substitution', key)]
+        else:
+            raise ValueError(f"unknown method {method!r}, choose from {', '.join(STREAM_METHODS)}")
+        
+        plan = self.compile(layers, decrypt)
+        try:
+            byte_table = plan.byte_table
+        except ValueError:
+            byte_table = None
+        return plan.table, byte_table, plan.ascii_only, plan.reverse
+    
+    # === STREAMING (files of any size) ===
+    def _stream_transform(self, method, shift, key, decrypt):
+        """Return (function on whole-character UTF-8 bytes, reversed?) for a method"""
+        text_table, byte_table, ascii_only, reverse = self._method_plan(method, shift, key, decrypt)
+        # ASCII blocks can skip decoding when the table only touches ASCII
+        if not ascii_only:
+            byte_table = None
+        
+        def transform(data):
+            if byte_table is not None and data.isascii():
+                data = data.translate(byte_table)
+                return data[::-1] if reverse else data
+            text = data.decode('utf-8', 'surrogateescape')
+            if reverse:
+                text = text[::-1]
+            return text.translate(text_table).encode('utf-8', 'surrogateescape')
+        
+        return transform, reverse
+    
+    def encrypt_stream(self, infile, outfile, method='caesar', shift=3, key=None,
+                       decrypt=False, chunk_size=CHUNK_SIZE):
+        """Encrypt (or decrypt) binary file object infile into outfile, chunk by chunk
+        
+        The text is read as UTF-8 (invalid bytes pass through untouched) and
+        memory use stays around chunk_size whatever the file size. reverse
+        and multi read infile backwards through mmap, so it must be a real
+        file; encrypt_file copies stdin to a temporary file first.
+        """
+        transform, reverse = self._stream_transform(method, shift, key, decrypt)
+        blocks = _backward_blocks(infile, chunk_size) if reverse else _forward_blocks(infile, chunk_size)
+        for block in blocks:
+            outfile.write(transform(block))
+    
+    def encrypt_file(self, source, target, method='caesar', shift=3, key=None,
+                     decrypt=False, chunk_size=CHUNK_SIZE):
+        """encrypt_stream between two paths; '-' means stdin / stdout"""
+        _, reverse = self._stream_transform(method, shift, key, decrypt)
+        if ('-' not in (source, target) and os.path.exists(target)
+                and os.path.samefile(source, target)):
+            # Opening the target would truncate the input before it is read
+            raise ValueError(f"{target} is the input file; write to another file")
+        infile = sys.stdin.buffer if source == '-' else open(source, 'rb')
+        outfile = sys.stdout.buffer if target == '-' else open(target, 'wb')
+        try:
+            if reverse and not infile.seekable():
+                # A pipe can't be read backwards: spool it to disk first
+                spool = tempfile.TemporaryFile()
+                shutil.copyfileobj(infile, spool, chunk_size)
+                spool.flush()
+                if infile is not sys.stdin.buffer:
+                    infile.close()
+                infile = spool
+            self.encrypt_stream(infile, outfile, method, shift, key, decrypt, chunk_size)
+        finally:
+            if infile is not sys.stdin.buffer:
+                infile.close()
+            if outfile is sys.stdout.buffer:
+                outfile.flush()
             else:
-                result += char
-        return result
+                outfile.close()
+    
+    # === BULK (all cores) ===
+    def bulk_encrypt(self, data, method='caesar', shift=3, key=None, decrypt=False,
+                     workers=None, chunk_size=BULK_CHUNK_SIZE):
+        """Encrypt (or decrypt) one large bytes-like buffer across a process pool
+        
+        Gives the same bytes as the method on data (e.g. caesar_encrypt(data)).
+        data is copied once into shared memory, each worker translates its
+        chunks there, and the result is read back from it, so no data is
+        pickled. workers defaults to all cores; inputs of one chunk or less
+        run in this process.
+        """
+        _, table, _, reverse = self._method_plan(method, shift, key, decrypt)
+        if table is None:
+            raise ValueError("this key maps to characters that don't fit in bytes")
+        data = memoryview(data).cast('B')
+        size = len(data)
+        spans = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+        workers = min(workers or os.cpu_count() or 1, len(spans))
+        if workers <= 1:
+            result = bytes(data).translate(table)
+            return result[::-1] if reverse else result
+        
+        # Reversed output can't overwrite the input in place: it goes after it
+        segment = shared_memory.SharedMemory(create=True, size=2 * size if reverse else size)
+        try:
+            segment.buf[:size] = data
+            with ProcessPoolExecutor(max_workers=workers, initializer=_bulk_init,
+                                     initargs=(segment.name, table)) as pool:
+                tasks = [(start, end, size if reverse else 0) for start, end in spans]
+                for _ in pool.map(_bulk_span, tasks):
+                    pass
+            with segment.buf[size:] if reverse else segment.buf[:size] as view:
+                return bytes(view)
+        finally:
+            segment.close()
+            segment.unlink()
+    
+    def encrypt_batch(self, messages, method='caesar', shift=3, key=None, decrypt=False,
+                      workers=None, chunk_size=BULK_CHUNK_SIZE):
+        """Encrypt (or decrypt) a list of messages across a process pool, in order
+        
+        messages are all str or all bytes-like; results are str or bytes to
+        match. They are packed into one shared memory block with an offset
+        table and each worker translates a run of messages in place. Tables
+        touching non-ASCII characters can't work on UTF-8 bytes, so str
+        messages then run one by one in this process.
+        """
+        text_table, byte_table, ascii_only, reverse = self._method_plan(method, shift, key, decrypt)
+        messages = list(messages)
+        text = bool(messages) and isinstance(messages[0], str)
+        if any(isinstance(message, str) != text for message in messages):
+            raise TypeError("messages must be all str or all bytes")
+        if byte_table is None and not text:
+            raise ValueError("this key maps to characters that don't fit in bytes")
+        
+        if text:
+            packed = [message.encode('utf-8', 'surrogatepass') for message in messages]
+        else:
+            packed = [memoryview(message).cast('B') for message in messages]
+        offsets = array('q', [0])
+        for message in packed:
+            offsets.append(offsets[-1] + len(message))
+        total = offsets[-1]
+        
+        tasks = []
+        first = 0
+        while first < len(messages):
+            last = bisect.bisect_left(offsets, offsets[first] + chunk_size, first + 1)
+            last = min(max(last, first + 1), len(messages))
+            tasks.append((first, last, text, reverse))
+            first = last
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        if workers <= 1 or (text and not ascii_only):
+            table = text_table if text else byte_table
+            results = []
+            for message in messages:
+                result = message if text else bytes(message)
+                results.append((result[::-1] if reverse else result).translate(table))
+            return results
+        
+        header = len(offsets) * offsets.itemsize
+        segment = shared_memory.SharedMemory(create=True, size=header + total)
+        try:
+            with segment.buf[:header] as view:
+                view[:] = offsets.tobytes()
+            with segment.buf[header:] as view:
+                for message, start, end in zip(packed, offsets, offsets[1:]):
+                    view[start:end] = message
+                with ProcessPoolExecutor(max_workers=workers, initializer=_bulk_init,
+                                         initargs=(segment.name, byte_table, len(messages))) as pool:
+                    for _ in pool.map(_bulk_messages, tasks):
+                        pass
+                if text:
+                    return [str(view[start:end], 'utf-8', 'surrogatepass')
+                            for start, end in zip(offsets, offsets[1:])]
+                return [bytes(view[start:end]) for start, end in zip(offsets, offsets[1:])]
+        finally:
+            segment.close()
+            segment.unlink()
     
     # === REVERSE CIPHER (Simple but effective) ===
     def reverse_encrypt(self, message):
@@ -59,24 +339,331 @@ class SimpleEncryption:
     
     # === MULTI-LAYER (Combine methods) ===
     def multi_encrypt(self, message, shift=5):
-        """Apply multiple encryption methods"""
-        # Step 1: Caesar cipher
-        step1 = self.caesar_encrypt(message, shift)
-        # Step 2: Reverse
-        step2 = self.reverse_encrypt(step1)
-        # Step 3: Caesar again with different shift
-        step3 = self.caesar_encrypt(step2, shift + 2)
-        return step3
+        """Apply multiple encryption methods
+        
+        Caesar, reverse, then Caesar again with a different shift; compiled
+        into one table plus a reversal, so it is a single pass.
+        """
+        return self._multi_plan(shift, False).apply(message)
     
     def multi_decrypt(self, encrypted_message, shift=5):
         """Reverse all the encryption steps"""
-        # Reverse step 3
-        step1 = self.caesar_decrypt(encrypted_message, shift + 2)
-        # Reverse step 2
-        step2 = self.reverse_decrypt(step1)
-        # Reverse step 1
-        step3 = self.caesar_decrypt(step2, shift)
-        return step3
+        return self._multi_plan(shift, True).apply(encrypted_message)
+    
+    def _multi_plan(self, shift, decrypt):
+        # Looked up by shift alone: short messages shouldn't pay for compile's layer specs
+        cache_key = ('multi', self.chars, shift, decrypt)
+        plan = self._tables.get(cache_key)
+        if plan is None:
+            plan = self.compile([('caesar', shift), 'reverse', ('caesar', shift + 2)], decrypt)
+            plan = self._remember(cache_key, plan)
+        return plan
+
+
+class CipherKey(Mapping):
+    """A substitution key with its forward and inverse tables built once
+
+    Reads like the dict from create_simple_key, so it goes anywhere a key
+    does, but it can't be changed. The str tables are made up front and
+    the bytes ones on first use; the ciphers use them directly, so a call
+    with a CipherKey does no setup. to_bytes()/from_bytes() give a compact
+    form, and pickling sends only that to other processes.
+    """
+
+    def __init__(self, mapping):
+        self._key = dict(mapping)
+        self.pairs = tuple(self._key.items())
+        self._tables = {(False, False): _key_table(self._key, False, False),
+                        (False, True): _key_table(self._key, False, True)}
+
+    def __getitem__(self, char):
+        return self._key[char]
+
+    def __iter__(self):
+        return iter(self._key)
+
+    def __len__(self):
+        return len(self._key)
+
+    def __hash__(self):
+        return hash(self.pairs)
+
+    def __repr__(self):
+        return f"CipherKey({len(self._key)} characters)"
+
+    def __reduce__(self):
+        return CipherKey.from_bytes, (self.to_bytes(),)
+
+    def table(self, binary=False, reverse=False):
+        """str.translate (or bytes.translate) table, inverse with reverse"""
+        table = self._tables.get((binary, reverse))
+        if table is None:
+            table = self._tables[binary, reverse] = _key_table(self._key, binary, reverse)
+        return table
+
+    def encrypt(self, message):
+        """Same as substitution_encrypt(message, self)"""
+        return message.translate(self.table(isinstance(message, (bytes, bytearray))))
+
+    def decrypt(self, encrypted_message):
+        """Same as substitution_decrypt(encrypted_message, self)"""
+        return encrypted_message.translate(
+            self.table(isinstance(encrypted_message, (bytes, bytearray)), True))
+
+    def to_bytes(self):
+        """Compact UTF-8 form: the key and value characters as two strings"""
+        keys, values = list(self._key), list(self._key.values())
+        if all(isinstance(c, str) and len(c) == 1 for c in keys + values):
+            data = [''.join(keys), ''.join(values)]
+        else:
+            data = self._key
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Read a key written by to_bytes"""
+        data = json.loads(data)
+        if isinstance(data, list):
+            data = zip(*data)
+        return cls(data)
+
+
+def _single_chars(pairs):
+    """The (key, value) pairs whose key is one character, as a dict"""
+    # Messages are matched one character at a time, so longer keys never apply
+    return {k: v for k, v in pairs if isinstance(k, str) and len(k) == 1}
+
+
+def _key_table(key, binary, reverse):
+    """Build the translation table for a substitution key (or its inverse)"""
+    mapping = {v: k for k, v in key.items()} if reverse else key
+    mapping = _single_chars(mapping.items())
+    if binary:
+        if not all(len(v) == 1 and ord(v) < 256 for v in mapping.values()):
+            raise ValueError("this key maps to characters that don't fit in bytes")
+        mapping = {k: v for k, v in mapping.items() if ord(k) < 256}
+        return bytes.maketrans(''.join(mapping).encode('latin-1'),
+                               ''.join(mapping.values()).encode('latin-1'))
+    return str.maketrans(mapping)
+
+
+class CipherPlan:
+    """A stack of cipher layers reduced to one translate table plus an optional reversal
+
+    Translation layers compose into one character map. A reversal can be
+    moved to the front by reversing every mapped string (which only matters
+    for multi-character key values), so any stack needs a single pass:
+    reverse the message if needed, then translate.
+    Build plans with SimpleEncryption.compile, which caches them.
+    """
+
+    def __init__(self, layers):
+        self.layers = layers
+        mapping = {}
+        reverse = False
+        for name, *args in layers:
+            if name == 'reverse':
+                reverse = not reverse
+                mapping = {c: v[::-1] for c, v in mapping.items()}
+                continue
+            if name == 'caesar':
+                chars, shift = args
+                table = dict(zip(chars, chars[shift:] + chars[:shift]))
+            else:
+                table = _single_chars(args[0])
+            mapping = {c: ''.join(table.get(ch, ch) for ch in v) for c, v in mapping.items()}
+            for c, v in table.items():
+                mapping.setdefault(c, v)
+        # Characters that end up as themselves need no table entry
+        self.mapping = {c: v for c, v in mapping.items() if v != c}
+        self.reverse = reverse
+        self.table = str.maketrans(self.mapping)
+        self.ascii_only = all(c.isascii() and v.isascii() and len(v) == 1
+                              for c, v in self.mapping.items())
+        self._byte_table = None
+
+    @property
+    def byte_table(self):
+        """bytes.translate table (characters as Latin-1 bytes), built on first use"""
+        if self._byte_table is None:
+            mapping = {c: v for c, v in self.mapping.items() if ord(c) < 256}
+            if not all(len(v) == 1 and ord(v) < 256 for v in mapping.values()):
+                raise ValueError("this key maps to characters that don't fit in bytes")
+            self._byte_table = bytes.maketrans(''.join(mapping).encode('latin-1'),
+                                               ''.join(mapping.values()).encode('latin-1'))
+        return self._byte_table
+
+    def apply(self, message):
+        """Run the plan over a str, or over bytes/bytearray"""
+        if self.reverse:
+            message = message[::-1]
+        if isinstance(message, (bytes, bytearray)):
+            return message.translate(self.byte_table)
+        return message.translate(self.table)
+
+    def __repr__(self):
+        return f"CipherPlan({len(self.mapping)} mapped characters, reverse={self.reverse})"
+
+
+def _inverse_layer(layer):
+    """The layer that undoes layer; substitution flips its key (mixed -> original)"""
+    name, *args = layer
+    if name == 'reverse':
+        return layer
+    if name == 'caesar':
+        chars, shift = args
+        return (name, chars, -shift % len(chars))
+    return (name, tuple((v, k) for k, v in args[0]))
+
+
+# Shared memory block and table a bulk worker process works on, set by _bulk_init
+_bulk_segment = None
+_bulk_table = None
+_bulk_offsets = None
+
+
+def _bulk_init(name, table, count=None):
+    """Attach a pool worker to the bulk job's shared memory"""
+    global _bulk_segment, _bulk_table, _bulk_offsets
+    _bulk_segment = shared_memory.SharedMemory(name=name)
+    _bulk_table = table
+    if count is not None:
+        _bulk_offsets = _bulk_segment.buf[:(count + 1) * 8].cast('q')
+
+
+def _bulk_span(task):
+    """Translate buf[start:end]; in place, or reversed into the output half"""
+    start, end, size = task
+    buf = _bulk_segment.buf
+    data = bytes(buf[start:end]).translate(_bulk_table)
+    if size:
+        buf[2 * size - end:2 * size - start] = data[::-1]
+    else:
+        buf[start:end] = data
+    return end - start
+
+
+def _bulk_messages(task):
+    """Translate messages first to last (exclusive) in place"""
+    first, last, text, reverse = task
+    buf, offsets = _bulk_segment.buf, _bulk_offsets
+    base = len(offsets) * 8
+    start, end = offsets[first], offsets[last]
+    data = bytes(buf[base + start:base + end]).translate(_bulk_table)
+    if reverse:
+        pieces = []
+        for i in range(first, last):
+            piece = data[offsets[i] - start:offsets[i + 1] - start]
+            if text and not piece.isascii():
+                # Reverse characters, not UTF-8 bytes; the length stays the same
+                piece = piece.decode('utf-8', 'surrogatepass')[::-1].encode('utf-8', 'surrogatepass')
+            else:
+                piece = piece[::-1]
+            pieces.append(piece)
+        data = b''.join(pieces)
+    buf[base + start:base + end] = data
+    return last - first
+
+
+def _complete_length(data):
+    """Length of data up to the end of its last complete UTF-8 character"""
+    end = len(data)
+    lead = end - 1
+    while lead >= 0 and end - lead < 4 and data[lead] & 0xC0 == 0x80:
+        lead -= 1
+    if lead < 0:
+        return end
+    first = data[lead]
+    size = 1 if first < 0x80 else 2 if first >> 5 == 6 else 3 if first >> 4 == 14 else 4 if first >> 3 == 30 else 1
+    return end if end - lead >= size else lead
+
+
+def _forward_blocks(infile, chunk_size):
+    """Yield infile in chunks that never split a UTF-8 character"""
+    pending = b''
+    while True:
+        data = infile.read(chunk_size)
+        if not data:
+            break
+        data = pending + data
+        cut = _complete_length(data)
+        pending = data[cut:]
+        if cut:
+            yield data[:cut]
+    if pending:
+        yield pending
+
+
+def _backward_blocks(infile, chunk_size):
+    """Yield infile's blocks from the end to the start, read through mmap
+
+    Block starts are moved past UTF-8 continuation bytes, so every block
+    holds whole characters and can be reversed on its own.
+    """
+    chunk_size = max(chunk_size, 4)
+    size = os.fstat(infile.fileno()).st_size
+    if size == 0:
+        return
+    with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        end = size
+        while end > 0:
+            start = max(0, end - chunk_size)
+            while start > 0 and end - start > 1 and data[start] & 0xC0 == 0x80:
+                start += 1
+            yield data[start:end]
+            if hasattr(data, 'madvise'):
+                # Drop the pages already read so resident memory stays flat
+                page = start - start % mmap.PAGESIZE
+                data.madvise(mmap.MADV_DONTNEED, page, end - page)
+            end = start
+
+
+def load_key(filename):
+    """Read a substitution key saved by save_key, as a CipherKey"""
+    with open(filename, encoding='utf-8') as f:
+        return CipherKey(json.load(f))
+
+
+def save_key(key, filename):
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(dict(key), f, ensure_ascii=False)
+
+
+def cli_main(argv=None):
+    """Command line: python encryptndecrypt.py encrypt|decrypt [options] input output"""
+    parser = argparse.ArgumentParser(prog="encryptndecrypt.py",
+                                     description="Encrypt or decrypt files of any size")
+    parser.add_argument('action', choices=('encrypt', 'decrypt'))
+    parser.add_argument('source', help="input file, or - for stdin")
+    parser.add_argument('target', help="output file, or - for stdout")
+    parser.add_argument('--method', choices=STREAM_METHODS, default='caesar')
+    parser.add_argument('--shift', type=int, default=3)
+    parser.add_argument('--key', help="substitution key file (JSON)")
+    parser.add_argument('--new-key', help="create a random substitution key, save it here and use it")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    crypto = SimpleEncryption()
+    key = None
+    if args.new_key:
+        key = crypto.create_key()
+        save_key(key, args.new_key)
+    elif args.key:
+        key = load_key(args.key)
+    if args.method == 'substitution' and key is None:
+        parser.error("substitution needs --key or --new-key")
+
+    try:
+        crypto.encrypt_file(args.source, args.target, method=args.method, shift=args.shift,
+                            key=key, decrypt=args.action == 'decrypt', chunk_size=args.chunk_size)
+    except ValueError as error:
+        parser.error(str(error))
+    return 0
+
+
+def check_mark(decrypted, original):
+    """✓ when decryption gave the original back, ✗ when it didn't"""
+    return "✓" if decrypted == original else "✗ (decryption doesn't match!)"
 
 
 def main():
@@ -148,23 +735,23 @@ def main():
             # Test Caesar
             caesar_enc = crypto.caesar_encrypt(test_message, 7)
             caesar_dec = crypto.caesar_decrypt(caesar_enc, 7)
-            print(f"Caesar: '{caesar_enc}' -> '{caesar_dec}' ✓")
+            print(f"Caesar: '{caesar_enc}' -> '{caesar_dec}' {check_mark(caesar_dec, test_message)}")
             
             # Test Substitution
             key = crypto.create_simple_key()
             sub_enc = crypto.substitution_encrypt(test_message, key)
             sub_dec = crypto.substitution_decrypt(sub_enc, key)
-            print(f"Substitution: '{sub_enc}' -> '{sub_dec}' ✓")
+            print(f"Substitution: '{sub_enc}' -> '{sub_dec}' {check_mark(sub_dec, test_message)}")
             
             # Test Reverse
             rev_enc = crypto.reverse_encrypt(test_message)
             rev_dec = crypto.reverse_decrypt(rev_enc)
-            print(f"Reverse: '{rev_enc}' -> '{rev_dec}' ✓")
+            print(f"Reverse: '{rev_enc}' -> '{rev_dec}' {check_mark(rev_dec, test_message)}")
             
             # Test Multi-layer
             multi_enc = crypto.multi_encrypt(test_message, 4)
             multi_dec = crypto.multi_decrypt(multi_enc, 4)
-            print(f"Multi-layer: '{multi_enc}' -> '{multi_dec}' ✓")
+            print(f"Multi-layer: '{multi_enc}' -> '{multi_dec}' {check_mark(multi_dec, test_message)}")
             
         elif choice == "6":
             print("Goodbye! 👋")
@@ -184,19 +771,22 @@ def quick_demo():
     
     encrypted = crypto.caesar_encrypt(message, 5)
     decrypted = crypto.caesar_decrypt(encrypted, 5)
-    print(f"Caesar: {encrypted} -> {decrypted}")
+    print(f"Caesar: {encrypted} -> {decrypted} {check_mark(decrypted, message)}")
     
     key = crypto.create_simple_key()
     encrypted = crypto.substitution_encrypt(message, key)
     decrypted = crypto.substitution_decrypt(encrypted, key)
-    print(f"Substitution: {encrypted} -> {decrypted}")
+    print(f"Substitution: {encrypted} -> {decrypted} {check_mark(decrypted, message)}")
     
     encrypted = crypto.multi_encrypt(message, 3)
     decrypted = crypto.multi_decrypt(encrypted, 3)
-    print(f"Multi-layer: {encrypted} -> {decrypted}")
+    print(f"Multi-layer: {encrypted} -> {decrypted} {check_mark(decrypted, message)}")
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(cli_main())
+    
     # Show quick demo first
     quick_demo()
     print("\n" + "="*50 + "\n")
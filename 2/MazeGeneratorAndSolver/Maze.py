@@ -1,10 +1,139 @@
+import argparse
+import heapq
+import json
+import mmap
+import os
 import random
-from collections import deque
+import struct
+import sys
+import time
+import tracemalloc
+import zlib
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, permutations
+
+WALL = 1
+PATH = 0
+
+# Text form of a grid row: b'1' for walls, b'0' for paths
+_ROW_TO_TEXT = bytes.maketrans(b'\x00\x01', b'01')
+_TEXT_TO_ROW = bytes.maketrans(b'01', b'\x00\x01')
+
+
+class MazeGrid:
+    """Compact maze grid stored as one byte per cell in a flat bytearray.
+
+    Cell (x, y) lives at index y * width + x of `cells`. The old
+    list-of-lists access still works: maze[y] returns a memoryview of that
+    row (no copy), so maze[y][x] reads and writes the same bytes. Use
+    to_lists() when a real nested list is needed.
+
+    Memory: 1 byte per cell. A list of int lists costs about 8 bytes per
+    cell (one pointer per entry) plus a list header per row, see
+    measure_grid_memory().
+    """
+
+    def __init__(self, width, height, fill=WALL):
+        self.width = width
+        self.height = height
+        self.cells = bytearray([fill]) * (width * height)
+        # Provenance, kept in .maze files
+        self.seed = None
+        self.algorithm = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a grid from a list of rows (lists, bytes or row views)"""
+        height = len(rows)
+        width = len(rows[0])
+        grid = cls(width, height)
+        for y, row in enumerate(rows):
+            grid.cells[y * width:(y + 1) * width] = bytes(row)
+        return grid
+
+    @classmethod
+    def from_text(cls, lines):
+        """Build a grid from lines of '0'/'1' as written by MazeGenerator.stream_maze"""
+        rows = []
+        for line in lines:
+            if isinstance(line, str):
+                line = line.encode('ascii')
+            line = line.strip()
+            if line:
+                rows.append(line.translate(_TEXT_TO_ROW))
+        return cls.from_rows(rows)
+
+    def index(self, x, y):
+        """Flat index of cell (x, y)"""
+        return y * self.width + x
+
+    def is_open(self, x, y):
+        return self.cells[y * self.width + x] == PATH
+
+    def to_lists(self):
+        """Copy the grid into the original list-of-lists form"""
+        width = self.width
+        return [list(self.cells[y * width:(y + 1) * width])
+                for y in range(self.height)]
+
+    @property
+    def nbytes(self):
+        return len(self.cells)
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError("maze row out of range")
+        return memoryview(self.cells)[y * self.width:(y + 1) * self.width]
+
+    def __iter__(self):
+        for y in range(self.height):
+            yield self[y]
+
+
+def measure_grid_memory(size=1001):
+    """Measure bytes per cell for a list-of-lists maze vs a MazeGrid"""
+    results = {}
+
+    tracemalloc.start()
+    rows = [[WALL for _ in range(size)] for _ in range(size)]
+    results['list_of_lists'] = tracemalloc.get_traced_memory()[0] / (size * size)
+    del rows
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    grid = MazeGrid(size, size)
+    results['maze_grid'] = tracemalloc.get_traced_memory()[0] / (size * size)
+    del grid
+    tracemalloc.stop()
+
+    return results
+
+
+# Generation engines for MazeGenerator(algorithm=...): name -> method
+ENGINES = {
+    'dfs': '_generate_dfs',
+    'kruskal': '_generate_kruskal',
+    'prim': '_generate_prim',
+    'wilson': '_generate_wilson',
+    'division': '_generate_division',
+}
+
 
 class MazeGenerator:
-    """Generate random solvable mazes using DFS algorithm"""
+    """Generate random solvable mazes (DFS by default, see ENGINES)"""
     
-    def __init__(self, width, height):
+    def __init__(self, width, height, rng=None, algorithm='dfs'):
+        # Random source: pass a seeded random.Random for reproducible mazes
+        self.rng = rng if rng is not None else random
+        # Generation engine used by generate_maze, a key of ENGINES
+        self.algorithm = algorithm
         self.width = width
         self.height = height
         # Make sure dimensions are odd for proper maze structure
@@ -15,105 +144,745 @@ class MazeGenerator:
         self.width = width
         self.height = height
         
-        # Initialize maze with all walls (1 = wall, 0 = path)
-        self.maze = [[1 for _ in range(width)] for _ in range(height)]
+        # Maze with all walls (1 = wall, 0 = path), allocated on first use
+        # so streaming generation never holds the full grid
+        self._maze = None
+    
+    @property
+    def maze(self):
+        if self._maze is None:
+            self._maze = MazeGrid(self.width, self.height)
+        return self._maze
+    
+    @maze.setter
+    def maze(self, value):
+        self._maze = value
         
     def generate_maze(self, start_x=1, start_y=1):
+        """Generate maze with the engine picked by self.algorithm (see ENGINES)"""
+        if self.algorithm not in ENGINES:
+            raise ValueError(f"unknown maze algorithm {self.algorithm!r}, "
+                             f"choose from {', '.join(ENGINES)}")
+        if self.algorithm == 'dfs':
+            return self._generate_dfs(start_x, start_y)
+        getattr(self, ENGINES[self.algorithm])()
+        self.maze.algorithm = self.algorithm
+        return self.maze
+    
+    def _generate_dfs(self, start_x=1, start_y=1):
         """Generate maze using Depth-First Search (DFS) with backtracking"""
-        # Stack for DFS
-        stack = [(start_x, start_y)]
+        cells = self.maze.cells
+        width = self.width
+        
+        # Stack for DFS (flat cell indices)
+        start = start_y * width + start_x
+        stack = [start]
         
         # Mark starting position as path
-        self.maze[start_y][start_x] = 0
+        cells[start] = 0
         
-        # Directions: right, down, left, up
-        directions = [(2, 0), (0, 2), (-2, 0), (0, -2)]
+        # Directions as (dx, dy, flat offset): right, down, left, up
+        directions = [(2, 0, 2), (0, 2, 2 * width), (-2, 0, -2), (0, -2, -2 * width)]
         
         while stack:
-            current_x, current_y = stack[-1]
+            current = stack[-1]
+            current_y, current_x = divmod(current, width)
             
             # Get all valid neighbors
             neighbors = []
-            for dx, dy in directions:
+            for dx, dy, offset in directions:
                 new_x, new_y = current_x + dx, current_y + dy
                 
                 # Check if neighbor is within bounds and is a wall
                 if (0 < new_x < self.width - 1 and 
                     0 < new_y < self.height - 1 and 
-                    self.maze[new_y][new_x] == 1):
-                    neighbors.append((new_x, new_y))
+                    cells[current + offset] == 1):
+                    neighbors.append(current + offset)
             
             if neighbors:
                 # Choose random neighbor
-                next_x, next_y = random.choice(neighbors)
+                next_cell = self.rng.choice(neighbors)
                 
                 # Remove wall between current cell and chosen neighbor
-                wall_x = current_x + (next_x - current_x) // 2
-                wall_y = current_y + (next_y - current_y) // 2
-                
-                self.maze[wall_y][wall_x] = 0
-                self.maze[next_y][next_x] = 0
+                # (offsets are even, so the wall sits at the midpoint index)
+                cells[(current + next_cell) // 2] = 0
+                cells[next_cell] = 0
                 
                 # Add neighbor to stack
-                stack.append((next_x, next_y))
+                stack.append(next_cell)
             else:
                 # Backtrack
                 stack.pop()
         
         # Ensure start and end points are open
-        self.maze[1][1] = 0  # Start
-        self.maze[self.height - 2][self.width - 2] = 0  # End
+        cells[width + 1] = 0  # Start
+        cells[(self.height - 2) * width + self.width - 2] = 0  # End
         
+        self.maze.algorithm = 'dfs'
         return self.maze
     
-    def print_maze(self, path=None, solution_path=None):
-        """Print maze with optional path highlighting"""
-        symbols = {
-            1: '█',  # Wall
-            0: ' ',  # Path
-            'S': 'S',  # Start
-            'E': 'E',  # End
-            '.': '.',  # Visited during search
-            '*': '*'   # Solution path
-        }
+    def _open_cells(self):
+        """Open every cell (odd x, odd y), leaving all walls between them"""
+        cells, width = self.maze.cells, self.width
+        cols = (width - 1) // 2
+        for y in range(1, self.height - 1, 2):
+            cells[y * width + 1:y * width + width - 1:2] = bytes(cols)
+    
+    def _wall_between(self, a, b, cols):
+        """Grid index of the wall between logical cells a and b (b = a + 1 or a + cols)"""
+        cy, cx = divmod(a, cols)
+        if b == a + 1 and cols > 1:
+            return (2 * cy + 1) * self.width + 2 * cx + 2
+        return (2 * cy + 2) * self.width + 2 * cx + 1
+    
+    def _generate_kruskal(self):
+        """Randomized Kruskal: shuffled walls joined with a flat-array union-find"""
+        cells = self.maze.cells
+        cols, rows = (self.width - 1) // 2, (self.height - 1) // 2
+        self._open_cells()
+        parent = array('i', range(cols * rows))
         
-        # Create display maze
-        display = [[self.maze[y][x] for x in range(self.width)] for y in range(self.height)]
+        # Edge e joins cell e // 2 to its east (e even) or south (e odd) neighbour
+        edges = array('i', [e for a in range(cols * rows) for e in (2 * a, 2 * a + 1)
+                            if (e & 1 and a + cols < cols * rows) or
+                            (not e & 1 and a % cols + 1 < cols)])
+        self.rng.shuffle(edges)
         
-        # Mark start and end
-        display[1][1] = 'S'
-        display[self.height - 2][self.width - 2] = 'E'
+        for e in edges:
+            first = e >> 1
+            second = first + cols if e & 1 else first + 1
+            a, b = first, second
+            # Find both roots with path halving
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            if a != b:
+                parent[a] = b
+                cells[self._wall_between(first, second, cols)] = 0
+    
+    def _cell_neighbours(self, cell, cols, rows):
+        cx, cy = cell % cols, cell // cols
+        if cx > 0:
+            yield cell - 1
+        if cx + 1 < cols:
+            yield cell + 1
+        if cy > 0:
+            yield cell - cols
+        if cy + 1 < rows:
+            yield cell + cols
+    
+    def _generate_prim(self):
+        """Randomized Prim: grow from one cell, attaching a random frontier cell each step"""
+        cells = self.maze.cells
+        cols, rows = (self.width - 1) // 2, (self.height - 1) // 2
+        self._open_cells()
+        rng = self.rng
+        # 0 = outside, 1 = frontier, 2 = in the maze
+        state = bytearray(cols * rows)
+        frontier = []
         
-        # Mark search path if provided
-        if path:
-            for x, y in path:
-                if display[y][x] == 0:
-                    display[y][x] = '.'
+        def add(cell):
+            state[cell] = 2
+            for nbr in self._cell_neighbours(cell, cols, rows):
+                if not state[nbr]:
+                    state[nbr] = 1
+                    frontier.append(nbr)
         
-        # Mark solution path if provided
-        if solution_path:
-            for x, y in solution_path:
-                if display[y][x] not in ['S', 'E']:
-                    display[y][x] = '*'
+        add(rng.randrange(cols * rows))
+        while frontier:
+            # Random pick, removed by swapping with the last entry
+            i = int(rng.random() * len(frontier))
+            cell = frontier[i]
+            frontier[i] = frontier[-1]
+            frontier.pop()
+            inside = [nbr for nbr in self._cell_neighbours(cell, cols, rows) if state[nbr] == 2]
+            other = inside[int(rng.random() * len(inside))]
+            cells[self._wall_between(min(cell, other), max(cell, other), cols)] = 0
+            add(cell)
+    
+    def _generate_wilson(self):
+        """Wilson's algorithm: loop-erased random walks give a uniform spanning tree"""
+        cells = self.maze.cells
+        cols, rows = (self.width - 1) // 2, (self.height - 1) // 2
+        count = cols * rows
+        self._open_cells()
+        rand = self.rng.random
+        in_maze = bytearray(count)
+        # Last step taken out of each cell on the current walk; overwriting
+        # it on revisits is what erases the loops
+        next_cell = _index_array(count, -1)
+        moves = (1, -1, cols, -cols)
         
-        # Print maze
-        for row in display:
-            print(''.join(symbols.get(cell, str(cell)) for cell in row))
+        in_maze[int(rand() * count)] = 1
+        for start in range(count):
+            if in_maze[start]:
+                continue
+            cell = start
+            while not in_maze[cell]:
+                # Random step, retried when it would leave the grid
+                step = cell + moves[int(rand() * 4)]
+                while not (0 <= step < count and
+                           (abs(step - cell) == cols or step // cols == cell // cols)):
+                    step = cell + moves[int(rand() * 4)]
+                next_cell[cell] = step
+                cell = step
+            # Carve the loop-erased walk into the maze
+            cell = start
+            while not in_maze[cell]:
+                step = next_cell[cell]
+                in_maze[cell] = 1
+                cells[self._wall_between(min(cell, step), max(cell, step), cols)] = 0
+                cell = step
+    
+    def _generate_division(self):
+        """Recursive division: open the whole interior, then add walls with one gap each
+        
+        Each dividing wall is written with a single (strided for vertical
+        walls) bytearray slice assignment instead of cell by cell.
+        """
+        cells, width = self.maze.cells, self.width
+        cols, rows = (width - 1) // 2, (self.height - 1) // 2
+        rng = self.rng
+        for y in range(1, self.height - 1):
+            cells[y * width + 1:y * width + width - 1] = bytes(width - 2)
+        
+        # Regions in cell coordinates: (x0, y0, cell columns, cell rows)
+        regions = [(0, 0, cols, rows)]
+        while regions:
+            x0, y0, cw, ch = regions.pop()
+            if cw < 2 or ch < 2:
+                continue
+            if ch > cw or (ch == cw and rng.random() < 0.5):
+                # Horizontal wall below cell row y0 + k - 1, one gap
+                k = rng.randrange(1, ch)
+                row = 2 * (y0 + k) * width
+                cells[row + 2 * x0:row + 2 * (x0 + cw) + 1] = bytes([WALL]) * (2 * cw + 1)
+                cells[row + 2 * (x0 + rng.randrange(cw)) + 1] = PATH
+                regions.append((x0, y0, cw, k))
+                regions.append((x0, y0 + k, cw, ch - k))
+            else:
+                # Vertical wall right of cell column x0 + k - 1, one gap
+                k = rng.randrange(1, cw)
+                col = 2 * (x0 + k)
+                top = 2 * y0 * width + col
+                cells[top:top + 2 * ch * width + 1:width] = bytes([WALL]) * (2 * ch + 1)
+                cells[(2 * (y0 + rng.randrange(ch)) + 1) * width + col] = PATH
+                regions.append((x0, y0, k, ch))
+                regions.append((x0 + k, y0, cw - k, ch))
+    
+    def iter_generate(self, start_x=1, start_y=1):
+        """Generate the maze lazily, one carve at a time
+        
+        Same DFS backtracker as generate_maze, written as a generator: it
+        yields ('carve', x, y) for every cell it opens and keeps no history,
+        so a caller can run a bounded number of steps, resume later, or
+        stop with close(). Returns the maze when exhausted.
+        """
+        cells = self.maze.cells
+        width = self.width
+        start = start_y * width + start_x
+        stack = [start]
+        cells[start] = 0
+        yield ('carve', start_x, start_y)
+        
+        directions = [(2, 0, 2), (0, 2, 2 * width), (-2, 0, -2), (0, -2, -2 * width)]
+        while stack:
+            current = stack[-1]
+            current_y, current_x = divmod(current, width)
+            neighbors = [current + offset for dx, dy, offset in directions
+                         if 0 < current_x + dx < width - 1 and
+                         0 < current_y + dy < self.height - 1 and
+                         cells[current + offset] == 1]
+            if neighbors:
+                next_cell = self.rng.choice(neighbors)
+                for cell in ((current + next_cell) // 2, next_cell):
+                    cells[cell] = 0
+                    yield ('carve', cell % width, cell // width)
+                stack.append(next_cell)
+            else:
+                stack.pop()
+        
+        for x, y in ((1, 1), (width - 2, self.height - 2)):
+            if cells[y * width + x]:
+                cells[y * width + x] = 0
+                yield ('carve', x, y)
+        self.maze.algorithm = 'dfs'
+        return self.maze
+    
+    def generate_rows(self):
+        """Yield the maze one grid row at a time using Eller's algorithm
+        
+        Only the set labels of the current cell row are kept, so memory is
+        O(width) however tall the maze is. Rows are bytes in the usual
+        encoding (1 = wall, 0 = path).
+        """
+        width = self.width
+        cols = (width - 1) // 2
+        rows = (self.height - 1) // 2
+        rand = self.rng.random
+        
+        # Top border
+        yield bytes([WALL]) * width
+        
+        # Set label per column, and the columns in each set
+        sets = list(range(cols))
+        members = {c: [c] for c in range(cols)}
+        next_label = cols
+        
+        for r in range(rows):
+            last = r == rows - 1
+            
+            # Cell row: open every cell, then join some neighbours.
+            # The last row joins every pair still in different sets.
+            row = bytearray([WALL]) * width
+            row[1:width - 1:2] = bytes([PATH]) * cols
+            for c in range(cols - 1):
+                a, b = sets[c], sets[c + 1]
+                if a != b and (last or rand() < 0.5):
+                    row[2 * c + 2] = PATH
+                    # Relabel the smaller set into the larger one
+                    if len(members[a]) < len(members[b]):
+                        a, b = b, a
+                    for k in members[b]:
+                        sets[k] = a
+                    members[a].extend(members.pop(b))
+            yield bytes(row)
+            
+            if last:
+                break
+            
+            # Wall row below: every set carries on downwards at least once
+            below = bytearray([WALL]) * width
+            new_sets = [None] * cols
+            new_members = {}
+            for label, columns in members.items():
+                down = [c for c in columns if rand() < 0.5]
+                if not down:
+                    down = [self.rng.choice(columns)]
+                for c in down:
+                    below[2 * c + 1] = PATH
+                    new_sets[c] = label
+                new_members[label] = down
+            for c in range(cols):
+                if new_sets[c] is None:
+                    new_sets[c] = next_label
+                    new_members[next_label] = [c]
+                    next_label += 1
+            sets, members = new_sets, new_members
+            yield bytes(below)
+        
+        # Bottom border
+        yield bytes([WALL]) * width
+    
+    def generate_maze_eller(self):
+        """Generate the full maze in memory from generate_rows()"""
+        cells = self.maze.cells
+        width = self.width
+        for y, row in enumerate(self.generate_rows()):
+            cells[y * width:(y + 1) * width] = row
+        self.maze.algorithm = 'eller'
+        return self.maze
+    
+    def stream_maze(self, out):
+        """Write the maze row by row to a binary file or socket file as '0'/'1' lines"""
+        for row in self.generate_rows():
+            out.write(row.translate(_ROW_TO_TEXT) + b'\n')
+    
+    def save(self, filename, seed=None):
+        """Save the generated maze to a bit-packed .maze file"""
+        if seed is not None:
+            self.maze.seed = seed
+        save_maze(self.maze, filename)
+    
+    def save_streaming(self, filename, seed=None):
+        """Generate with Eller's algorithm straight into a .maze file (O(width) memory)"""
+        with open(filename, 'wb') as out:
+            write_maze(out, self.width, self.height, self.generate_rows(),
+                       seed=seed, algorithm='eller')
+    
+    def print_maze(self, path=None, solution_path=None):
+        """Print maze with optional path highlighting"""
+        render_maze(self.maze, sys.stdout, path=path, solution_path=solution_path)
         print()
+    
+    def render(self, out, path=None, solution_path=None):
+        """Write the text rendering to any file-like object"""
+        render_maze(self.maze, out, path=path, solution_path=solution_path)
+    
+    def save_image(self, filename, path=None, solution_path=None, scale=1):
+        """Save the maze as .png (walls, explored and solution in colour) or .pbm"""
+        with open(filename, 'wb') as out:
+            if filename.lower().endswith('.pbm'):
+                export_pbm(self.maze, out, scale=scale)
+            else:
+                export_png(self.maze, out, path=path,
+                           solution_path=solution_path, scale=scale)
+
+
+# Display codes used by the renderers, one byte per cell
+_SHOW_PATH, _SHOW_WALL, _SHOW_EXPLORED, _SHOW_SOLUTION, _SHOW_START, _SHOW_END = range(6)
+
+# Text glyphs per display code: ' ', '█', '.', '*', 'S', 'E'. The wall is
+# written as '#' by bytes.translate and swapped for '█' on the whole row.
+_TEXT_GLYPHS = bytes.maketrans(bytes(range(6)), b' #.*SE')
+
+# PNG palette per display code
+_PNG_PALETTE = bytes([
+    255, 255, 255,  # path
+    0, 0, 0,        # wall
+    170, 200, 255,  # explored
+    230, 40, 40,    # solution
+    40, 170, 40,    # start
+    40, 40, 220,    # end
+])
+
+
+def _display_cells(maze, path=None, solution_path=None, start=None, end=None):
+    """One display code per cell (a bytearray the size of the maze)
+
+    Marks come from a single pass over path and solution_path, so drawing
+    costs no list scans. Priority: start/end, then solution, then explored
+    (open cells only).
+    """
+    width = maze.width
+    marks = bytearray(maze.cells)
+    if path:
+        for x, y in path:
+            i = y * width + x
+            if marks[i] == _SHOW_PATH:
+                marks[i] = _SHOW_EXPLORED
+    if solution_path:
+        for x, y in solution_path:
+            marks[y * width + x] = _SHOW_SOLUTION
+    start = start or (1, 1)
+    end = end or (width - 2, maze.height - 2)
+    marks[start[1] * width + start[0]] = _SHOW_START
+    marks[end[1] * width + end[0]] = _SHOW_END
+    return marks
+
+
+def render_maze(maze, out, path=None, solution_path=None, start=None, end=None,
+                rows_per_write=256):
+    """Write the maze as text to a file-like object in one buffered pass"""
+    marks = _display_cells(maze, path, solution_path, start, end)
+    width = maze.width
+    for top in range(0, maze.height, rows_per_write):
+        bottom = min(top + rows_per_write, maze.height)
+        lines = [marks[y * width:(y + 1) * width].translate(_TEXT_GLYPHS)
+                 for y in range(top, bottom)]
+        out.write((b'\n'.join(lines) + b'\n').decode('ascii').replace('#', '█'))
+
+
+def _scaled_rows(marks, width, height, scale):
+    """Yield display rows, each cell repeated scale x scale times"""
+    if scale == 1:
+        for y in range(height):
+            yield marks[y * width:(y + 1) * width]
+        return
+    pixels = [bytes([code]) * scale for code in range(256)]
+    for y in range(height):
+        row = b''.join([pixels[code] for code in marks[y * width:(y + 1) * width]])
+        for _ in range(scale):
+            yield row
+
+
+def export_png(maze, out, path=None, solution_path=None, start=None, end=None,
+               scale=1):
+    """Write the maze as an 8-bit palette PNG to a binary file-like object"""
+    marks = _display_cells(maze, path, solution_path, start, end)
+    width, height = maze.width * scale, maze.height * scale
+
+    def chunk(kind, data):
+        out.write(struct.pack('>I', len(data)) + kind + data)
+        out.write(struct.pack('>I', zlib.crc32(kind + data)))
+
+    out.write(b'\x89PNG\r\n\x1a\n')
+    chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 3, 0, 0, 0))
+    chunk(b'PLTE', _PNG_PALETTE)
+    # Compress in slices of rows so the raw image never sits in memory
+    compressor = zlib.compressobj(1)
+    pending = []
+    for row in _scaled_rows(marks, maze.width, maze.height, scale):
+        pending.append(b'\x00' + row)  # filter type 0 per row
+        if len(pending) >= 256:
+            data = compressor.compress(b''.join(pending))
+            if data:
+                chunk(b'IDAT', data)
+            pending = []
+    chunk(b'IDAT', compressor.compress(b''.join(pending)) + compressor.flush())
+    chunk(b'IEND', b'')
+
+
+def export_pbm(maze, out, scale=1):
+    """Write the walls as a binary PBM (P4) image: walls black, paths white"""
+    width, height = maze.width * scale, maze.height * scale
+    out.write(b'P4\n%d %d\n' % (width, height))
+    pad = b'0' * (-width % 8)
+    row_bytes = (width + 7) // 8
+    for row in _scaled_rows(maze.cells, maze.width, maze.height, scale):
+        bits = row.translate(_ROW_TO_TEXT) + pad
+        out.write(int(bits, 2).to_bytes(row_bytes, 'big'))
+
+
+# .maze file: fixed header, algorithm and seed strings, then the cells
+# bit-packed row-major, 1 bit per cell (1 = wall), most significant bit first
+MAZE_MAGIC = b'MAZ1'
+_MAZE_HEADER = struct.Struct('<4sIIIHH')  # magic, data offset, width, height, len(algorithm), len(seed)
+
+
+def write_maze(out, width, height, rows, seed=None, algorithm=None):
+    """Write rows (bytes of 0/1 per cell) to a binary file in the .maze format
+
+    rows can be any iterable, e.g. MazeGenerator.generate_rows(), so a
+    streamed maze goes to disk without ever being held in memory.
+    """
+    algorithm = (algorithm or '').encode('utf-8')
+    seed = ('' if seed is None else str(seed)).encode('utf-8')
+    offset = _MAZE_HEADER.size + len(algorithm) + len(seed)
+    out.write(_MAZE_HEADER.pack(MAZE_MAGIC, offset, width, height,
+                                len(algorithm), len(seed)))
+    out.write(algorithm + seed)
+
+    # Cells pack across row boundaries, so carry the leftover (< 8) bits
+    pending = b''
+    for row in rows:
+        pending += bytes(row).translate(_ROW_TO_TEXT)
+        whole = len(pending) - len(pending) % 8
+        if whole:
+            out.write(int(pending[:whole], 2).to_bytes(whole // 8, 'big'))
+            pending = pending[whole:]
+    if pending:
+        pending += b'0' * (8 - len(pending))
+        out.write(int(pending, 2).to_bytes(1, 'big'))
+
+
+def save_maze(maze, filename):
+    """Save a MazeGrid to a .maze file"""
+    with open(filename, 'wb') as out:
+        write_maze(out, maze.width, maze.height, maze,
+                   seed=maze.seed, algorithm=maze.algorithm)
+
+
+def _read_maze_header(buf):
+    """Parse a .maze header; returns (data offset, width, height, algorithm, seed)"""
+    magic, offset, width, height, alg_len, seed_len = _MAZE_HEADER.unpack_from(buf)
+    if magic != MAZE_MAGIC:
+        raise ValueError("not a .maze file")
+    names = bytes(buf[_MAZE_HEADER.size:offset])
+    algorithm = names[:alg_len].decode('utf-8') or None
+    seed = names[alg_len:alg_len + seed_len].decode('utf-8') or None
+    return offset, width, height, algorithm, seed
+
+
+def _unpack_bits(data, count):
+    """Bit-packed bytes -> one byte (0/1) per cell, first `count` cells"""
+    bits = bin(int.from_bytes(data, 'big'))[2:].zfill(len(data) * 8)
+    return bits[:count].encode('ascii').translate(_TEXT_TO_ROW)
+
+
+def load_maze(filename):
+    """Load a .maze file fully into an in-memory MazeGrid"""
+    with open(filename, 'rb') as f:
+        head = f.read(_MAZE_HEADER.size)
+        offset, width, height, algorithm, seed = _read_maze_header(
+            head + f.read(_MAZE_HEADER.unpack(head)[1] - len(head)))
+        grid = MazeGrid(width, height)
+        grid.algorithm, grid.seed = algorithm, seed
+        # Unpack a block of whole bytes at a time
+        block = 1 << 20
+        done = 0
+        total = width * height
+        while done < total:
+            data = f.read(block)
+            if not data:
+                raise ValueError("truncated .maze file")
+            cells = _unpack_bits(data, total - done)
+            grid.cells[done:done + len(cells)] = cells
+            done += len(cells)
+    return grid
+
+
+class BitCells:
+    """Read-only, bytearray-like view of bit-packed cells in a buffer
+
+    Indexing returns 0/1 like MazeGrid.cells, so the solvers run on it
+    unchanged; only the bytes actually touched are read from the buffer.
+    """
+
+    def __init__(self, buf, offset, count):
+        self.buf = buf
+        self.offset = offset
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def _range(self, start, stop):
+        """Cells start..stop as bytes, unpacking only the bytes covering them"""
+        if start >= stop:
+            return b''
+        first = self.offset + (start >> 3)
+        last = self.offset + ((stop + 7) >> 3)
+        cells = _unpack_bits(self.buf[first:last], (last - first) * 8)
+        skip = start & 7
+        return cells[skip:skip + stop - start]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self.count)
+            if step == 1:
+                return self._range(start, stop)
+            return bytes(self[j] for j in range(start, stop, step))
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("cell index out of range")
+        return (self.buf[self.offset + (i >> 3)] >> (7 - (i & 7))) & 1
+
+    def __iter__(self):
+        block = 1 << 23
+        for start in range(0, self.count, block):
+            yield from self._range(start, min(start + block, self.count))
+
+    def find(self, value, start=0):
+        block = 1 << 23
+        for first in range(start, self.count, block):
+            found = self._range(first, min(first + block, self.count)).find(value)
+            if found >= 0:
+                return first + found
+        return -1
+
+
+class MappedMaze(MazeGrid):
+    """Read-only maze backed by a memory-mapped .maze file
+
+    Cells stay in the file (1 bit each) and are paged in by the OS as a
+    search touches them, so MazeSolver can work on mazes larger than RAM.
+    """
+
+    def __init__(self, filename):
+        self._file = open(filename, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        offset, width, height, algorithm, seed = _read_maze_header(self._map)
+        self.width = width
+        self.height = height
+        self.algorithm = algorithm
+        self.seed = seed
+        self.cells = BitCells(self._map, offset, width * height)
+
+    @property
+    def nbytes(self):
+        return (len(self.cells) + 7) // 8
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError("maze row out of range")
+        return self.cells[y * self.width:(y + 1) * self.width]
+
+    def close(self):
+        self.cells = None
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SolveStats:
+    """Counters for one MazeSolver run
+
+    expanded is the number of cells taken off the frontier, peak_frontier
+    the largest the stack/queue/heap got, phases the seconds spent in
+    'setup', 'search' and 'reconstruct', and peak_memory the tracemalloc
+    high-water mark in bytes (None unless the solver has trace_memory on).
+    """
+
+    def __init__(self, algorithm, trace_memory=False):
+        self.algorithm = algorithm
+        self.expanded = 0
+        self.peak_frontier = 0
+        self.solution_length = 0
+        self.phases = {}
+        self.peak_memory = None
+        self._trace_memory = trace_memory
+        self._started_tracing = False
+        if trace_memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                self._started_tracing = True
+        self._mark = time.perf_counter()
+
+    def phase(self, name):
+        """Charge the time since the last mark to phase `name`"""
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + now - self._mark
+        self._mark = now
+
+    def finish(self):
+        if self._trace_memory:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            if self._started_tracing:
+                tracemalloc.stop()
+            self._trace_memory = False
+
+    @property
+    def elapsed(self):
+        return sum(self.phases.values())
+
+    def as_dict(self):
+        return {
+            'algorithm': self.algorithm,
+            'expanded': self.expanded,
+            'peak_frontier': self.peak_frontier,
+            'solution_length': self.solution_length,
+            'phases': dict(self.phases),
+            'elapsed': self.elapsed,
+            'peak_memory': self.peak_memory,
+        }
 
 
 class MazeSolver:
-    """Solve mazes using DFS and BFS algorithms"""
+    """Solve mazes using DFS, BFS, A*, bidirectional BFS and a junction graph"""
     
-    def __init__(self, maze):
+    def __init__(self, maze, rng=None, record_path=True, on_expand=None,
+                 trace_memory=False):
+        # Random source for solve_dfs; pass a seeded random.Random to reproduce
+        self.rng = rng if rng is not None else random
+        # record_path=False skips the path_taken list (returned empty), so a
+        # solve only pays for the solution; on_expand(x, y) is called for
+        # every expanded cell instead, if given
+        self.record_path = record_path
+        self.on_expand = on_expand
+        # SolveStats of the last solve; trace_memory adds a tracemalloc peak
+        self.trace_memory = trace_memory
+        self.stats = None
+        # Accept the old list-of-lists form by copying it into a MazeGrid
+        if not isinstance(maze, MazeGrid):
+            maze = MazeGrid.from_rows(maze)
         self.maze = maze
-        self.height = len(maze)
-        self.width = len(maze[0])
+        self.height = maze.height
+        self.width = maze.width
         self.start = (1, 1)
         self.end = (self.width - 2, self.height - 2)
+        # Indexes built on first use by solve_graph() / solve_route(); set
+        # back to None after changing the maze
+        self.graph = None
+        self.router = None
     
     def get_neighbors(self, x, y):
         """Get valid neighboring cells"""
+        cells = self.maze.cells
+        width = self.width
         neighbors = []
         directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # down, right, up, left
         
@@ -121,82 +890,1302 @@ class MazeSolver:
             new_x, new_y = x + dx, y + dy
             
             # Check bounds and if cell is a path
-            if (0 <= new_x < self.width and 
+            if (0 <= new_x < width and 
                 0 <= new_y < self.height and 
-                self.maze[new_y][new_x] == 0):
+                cells[new_y * width + new_x] == 0):
                 neighbors.append((new_x, new_y))
         
         return neighbors
     
+    def _search_grid(self):
+        """Return (cells, width, pad) for the flat-index solvers, see _walled_cells"""
+        return _walled_cells(self.maze, (self.start, self.end))
+    
     def solve_dfs(self):
         """Solve maze using Depth-First Search"""
-        stack = [self.start]
-        visited = set()
-        parent = {}
-        path_taken = []
+        stats = self._begin('dfs')
+        cells, width, pad = self._search_grid()
+        start = _to_index(self.start, width, pad)
+        end = _to_index(self.end, width, pad)
+        stack = [start]
+        visited = bytearray(len(cells))
+        parent = _index_array(len(cells))
+        taken = [] if self.record_path else None
+        on_expand = self.on_expand
+        expanded = 0
+        peak = 1
         
-        visited.add(self.start)
-        parent[self.start] = None
+        visited[start] = 1
+        parent[start] = start
+        
+        # All 24 orderings of the neighbor offsets; picking one at random
+        # per step randomizes like shuffling the neighbor list, without
+        # building and shuffling a list for every cell
+        orders = list(permutations((width, 1, -width, -1)))
+        rand = self.rng.random
+        stats.phase('setup')
         
         while stack:
             current = stack.pop()
-            path_taken.append(current)
-            
-            if current == self.end:
-                # Reconstruct path
-                solution_path = []
-                while current is not None:
-                    solution_path.append(current)
-                    current = parent[current]
-                solution_path.reverse()
-                
-                return solution_path, path_taken
-            
+            expanded += 1
+            if taken is not None:
+                taken.append(current)
+            if on_expand is not None:
+                on_expand(current % width - pad, current // width - pad)
+        
+            if current == end:
+                break
+        
             # Explore neighbors
-            neighbors = self.get_neighbors(current[0], current[1])
-            # Randomize for more interesting paths
-            random.shuffle(neighbors)
-            
-            for neighbor in neighbors:
-                if neighbor not in visited:
-                    visited.add(neighbor)
+            for offset in orders[int(rand() * 24)]:
+                neighbor = current + offset
+                if cells[neighbor] == 0 and not visited[neighbor]:
+                    visited[neighbor] = 1
                     parent[neighbor] = current
                     stack.append(neighbor)
+            if len(stack) > peak:
+                peak = len(stack)
+        else:
+            current = None  # No solution found
         
-        return None, path_taken  # No solution found
+        stats.expanded, stats.peak_frontier = expanded, peak
+        solution = None if current is None else _trace(parent, current)
+        return self._finish(stats, solution, taken, width, pad)
     
     def solve_bfs(self):
         """Solve maze using Breadth-First Search"""
-        queue = deque([self.start])
-        visited = set()
-        parent = {}
-        path_taken = []
+        stats = self._begin('bfs')
+        cells, width, pad = self._search_grid()
+        start = _to_index(self.start, width, pad)
+        end = _to_index(self.end, width, pad)
+        queue = deque([start])
+        visited = bytearray(len(cells))
+        parent = _index_array(len(cells))
+        taken = [] if self.record_path else None
+        on_expand = self.on_expand
+        offsets = (width, 1, -width, -1)  # down, right, up, left
+        expanded = 0
+        peak = 1
         
-        visited.add(self.start)
-        parent[self.start] = None
+        visited[start] = 1
+        parent[start] = start
+        stats.phase('setup')
         
         while queue:
             current = queue.popleft()
-            path_taken.append(current)
-            
-            if current == self.end:
-                # Reconstruct path
-                solution_path = []
-                while current is not None:
-                    solution_path.append(current)
-                    current = parent[current]
-                solution_path.reverse()
-                
-                return solution_path, path_taken
-            
+            expanded += 1
+            if taken is not None:
+                taken.append(current)
+            if on_expand is not None:
+                on_expand(current % width - pad, current // width - pad)
+        
+            if current == end:
+                break
+        
             # Explore neighbors
-            for neighbor in self.get_neighbors(current[0], current[1]):
-                if neighbor not in visited:
-                    visited.add(neighbor)
+            for offset in offsets:
+                neighbor = current + offset
+                if cells[neighbor] == 0 and not visited[neighbor]:
+                    visited[neighbor] = 1
                     parent[neighbor] = current
                     queue.append(neighbor)
+            if len(queue) > peak:
+                peak = len(queue)
+        else:
+            current = None  # No solution found
+        
+        stats.expanded, stats.peak_frontier = expanded, peak
+        solution = None if current is None else _trace(parent, current)
+        return self._finish(stats, solution, taken, width, pad)
+    
+    def solve_astar(self):
+        """Solve maze using A* with the Manhattan distance heuristic"""
+        stats = self._begin('astar')
+        cells, width, pad = self._search_grid()
+        size = len(cells)
+        start = _to_index(self.start, width, pad)
+        end = _to_index(self.end, width, pad)
+        end_y, end_x = divmod(end, width)
+        offsets = (width, 1, -width, -1)
+        
+        # Heap entries are single ints packing (f, h, cell), so ties on f
+        # go to the cell closest to the goal and no tuple is built per push
+        h_span = width + size // width
+        
+        def key(cell, g):
+            y, x = divmod(cell, width)
+            h = abs(x - end_x) + abs(y - end_y)
+            return ((g + h) * h_span + h) * size + cell
+        
+        g_score = _index_array(size, -1)
+        closed = bytearray(size)
+        parent = _index_array(size)
+        taken = [] if self.record_path else None
+        on_expand = self.on_expand
+        expanded = 0
+        peak = 1
+        
+        g_score[start] = 0
+        parent[start] = start
+        heap = [key(start, 0)]
+        stats.phase('setup')
+        
+        while heap:
+            current = heapq.heappop(heap) % size
+            if closed[current]:
+                continue
+            closed[current] = 1
+            expanded += 1
+            if taken is not None:
+                taken.append(current)
+            if on_expand is not None:
+                on_expand(current % width - pad, current // width - pad)
+        
+            if current == end:
+                break
+        
+            g = g_score[current] + 1
+            for offset in offsets:
+                neighbor = current + offset
+                if cells[neighbor] == 0 and not closed[neighbor]:
+                    old = g_score[neighbor]
+                    if old < 0 or g < old:
+                        g_score[neighbor] = g
+                        parent[neighbor] = current
+                        heapq.heappush(heap, key(neighbor, g))
+            if len(heap) > peak:
+                peak = len(heap)
+        else:
+            current = None  # No solution found
+        
+        stats.expanded, stats.peak_frontier = expanded, peak
+        solution = None if current is None else _trace(parent, current)
+        return self._finish(stats, solution, taken, width, pad)
+    
+    def solve_bidirectional(self):
+        """Solve maze using Breadth-First Search from both ends at once"""
+        cells, width, pad = self._search_grid()
+        start = _to_index(self.start, width, pad)
+        end = _to_index(self.end, width, pad)
+        if cells[end] != 0 and start != end:
+            # A walled-in goal can't be searched from; report like BFS does
+            return self.solve_bfs()
+        
+        stats = self._begin('bidirectional')
+        offsets = (width, 1, -width, -1)
+        # side[i] is 1 if reached from start, 2 if reached from end. Each
+        # cell is reached from one side only, so one parent array is enough.
+        side = bytearray(len(cells))
+        parent = _index_array(len(cells))
+        taken = [] if self.record_path else None
+        on_expand = self.on_expand
+        expanded = 0
+        peak = 2
+        
+        side[start], side[end] = 1, 2
+        parent[start], parent[end] = start, end
+        frontiers = {1: [start], 2: [end]}
+        solution = [start] if start == end else None
+        stats.phase('setup')
+        
+        while solution is None and frontiers[1] and frontiers[2]:
+            # Grow the smaller frontier by one whole layer
+            this = 1 if len(frontiers[1]) <= len(frontiers[2]) else 2
+            other = 3 - this
+            next_layer = []
+            for current in frontiers[this]:
+                expanded += 1
+                if taken is not None:
+                    taken.append(current)
+                if on_expand is not None:
+                    on_expand(current % width - pad, current // width - pad)
+                for offset in offsets:
+                    neighbor = current + offset
+                    if cells[neighbor] != 0:
+                        continue
+                    if side[neighbor] == other:
+                        # Frontiers met: join the two half paths
+                        a, b = (current, neighbor) if this == 1 else (neighbor, current)
+                        solution = _trace(parent, a)
+                        solution.extend(reversed(_trace(parent, b)))
+                        break
+                    if not side[neighbor]:
+                        side[neighbor] = this
+                        parent[neighbor] = current
+                        next_layer.append(neighbor)
+                if solution is not None:
+                    break
+            frontiers[this] = next_layer
+            if len(next_layer) + len(frontiers[other]) > peak:
+                peak = len(next_layer) + len(frontiers[other])
+        
+        if start == end:
+            expanded = 1
+            if taken is not None:
+                taken.append(start)
+        stats.expanded, stats.peak_frontier = expanded, peak
+        return self._finish(stats, solution, taken, width, pad)
+    
+    def solve_wavefront(self):
+        """Solve maze with a bit-parallel BFS wavefront (see BitWavefront)
+
+        Finds a shortest path like solve_bfs, expanding whole layers with
+        big-int shifts and masks. path_taken lists the reached cells by
+        distance, which takes a per-cell pass; use record_path=False when
+        only the solution is needed.
+
+        Only faster than solve_bfs when the frontier is wide (open areas or
+        many loops: ~6x on an open grid, ~2x braided). On a perfect maze the
+        frontier is a few corridor cells and it is ~3.5x slower.
+        """
+        stats = self._begin('wavefront')
+        wave = BitWavefront(self.maze.cells, self.width, self.height)
+        stats.phase('setup')
+        distance, reached, slices = wave.run(self.start, self.end,
+                                             exact=self.record_path)
+        solution_path = None
+        if distance is not None:
+            solution_path = wave.trace(self.start, self.end, distance, reached, slices,
+                                       exact=self.record_path)
+        stats.phase('search')
+        stats.expanded = sum(bin(board).count('1') for board in reached)
+        path_taken = []
+        if self.record_path:
+            field = wave.field(reached, slices)
+            order = sorted((d, i) for i, d in enumerate(field) if d >= 0)
+            path_taken = [(i % self.width, i // self.width) for _, i in order]
+        if solution_path is not None:
+            stats.solution_length = len(solution_path)
+        stats.phase('reconstruct')
+        stats.finish()
+        return solution_path, path_taken
+    
+    def distance_field(self):
+        """Steps from self.start to every cell as a flat array('i') (y * width + x)
+
+        -1 marks cells that can't be reached. Computed with the bitboard
+        wavefront; useful for heatmaps or many distance lookups.
+        """
+        wave = BitWavefront(self.maze.cells, self.width, self.height)
+        _, reached, slices = wave.run(self.start, exact=True)
+        return wave.field(reached, slices)
+    
+    def iter_dfs(self):
+        """Depth-First Search as a generator of events
+        
+        Yields ('expand', x, y) for each expanded cell, then one
+        ('done', solution_path) with None when there is no solution. Only
+        the search state is kept (no path_taken), so many of these can be
+        advanced a few steps at a time by one loop, see advance().
+        """
+        return self._iter_search(depth_first=True)
+    
+    def iter_bfs(self):
+        """Breadth-First Search as a generator of events, see iter_dfs"""
+        return self._iter_search(depth_first=False)
+    
+    def _iter_search(self, depth_first):
+        cells, width, pad = self._search_grid()
+        start = _to_index(self.start, width, pad)
+        end = _to_index(self.end, width, pad)
+        visited = bytearray(len(cells))
+        parent = _index_array(len(cells))
+        visited[start] = 1
+        parent[start] = start
+        frontier = deque([start])
+        take = frontier.pop if depth_first else frontier.popleft
+        orders = list(permutations((width, 1, -width, -1)))
+        rand = self.rng.random
+        
+        while frontier:
+            current = take()
+            yield ('expand', current % width - pad, current // width - pad)
+            if current == end:
+                yield ('done', _to_points(_trace(parent, current), width, pad))
+                return
+            offsets = orders[int(rand() * 24)] if depth_first else orders[0]
+            for offset in offsets:
+                neighbor = current + offset
+                if cells[neighbor] == 0 and not visited[neighbor]:
+                    visited[neighbor] = 1
+                    parent[neighbor] = current
+                    frontier.append(neighbor)
+        yield ('done', None)
+    
+    def _begin(self, algorithm):
+        """Start a new SolveStats for this solve (kept in self.stats)"""
+        self.stats = SolveStats(algorithm, trace_memory=self.trace_memory)
+        return self.stats
+    
+    def _finish(self, stats, solution, taken, width, pad):
+        """Convert flat indices to (x, y) tuples and close the stats
         
-        return None, path_taken  # No solution found
+        path_taken is an empty list when record_path is off.
+        """
+        stats.phase('search')
+        solution_path = None
+        if solution is not None:
+            solution_path = _to_points(solution, width, pad)
+            stats.solution_length = len(solution_path)
+        path_taken = _to_points(taken, width, pad) if taken is not None else []
+        stats.phase('reconstruct')
+        stats.finish()
+        return solution_path, path_taken
+    
+    def solve_graph(self):
+        """Solve maze on the corridor-contracted JunctionGraph
+        
+        The graph is built once and reused by later calls, so repeated
+        solves on the same maze only search junctions. path_taken holds
+        the junction cells settled by the search.
+        """
+        stats = self._begin('graph')
+        if self.graph is None:
+            self.graph = JunctionGraph(self.maze)
+        stats.phase('setup')
+        solution_path = self.graph.shortest_path(self.start, self.end)
+        stats.phase('search')
+        path_taken = self.graph.settled_points()
+        stats.expanded = len(path_taken)
+        if solution_path is not None:
+            stats.solution_length = len(solution_path)
+        stats.phase('reconstruct')
+        stats.finish()
+        return solution_path, path_taken
+    
+    def solve_route(self, source=None, target=None):
+        """Shortest path between any two cells using the LandmarkRouter
+        
+        source and target default to self.start and self.end. Returns
+        just the path (or None); the router is built once and reused.
+        """
+        stats = self._begin('route')
+        if self.router is None:
+            self.router = LandmarkRouter(self.maze)
+        stats.phase('setup')
+        solution_path = self.router.route(source or self.start, target or self.end)
+        stats.expanded = self.router.last_expanded
+        if solution_path is not None:
+            stats.solution_length = len(solution_path)
+        stats.phase('search')
+        stats.finish()
+        return solution_path
+
+    def solve(self, name):
+        """Run the solver called name (see SOLVERS); returns (solution_path, path_taken)
+
+        Solvers that only return a path (solve_route) get an empty path_taken.
+        """
+        result = getattr(self, SOLVERS[name])()
+        return result if isinstance(result, tuple) else (result, [])
+
+
+# Solver name -> MazeSolver method: every solve_* method, so new ones are
+# picked up by the service and the benchmark without listing them again
+SOLVERS = {name[len('solve_'):]: name for name in vars(MazeSolver) if name.startswith('solve_')}
+
+
+class JunctionGraph:
+    """Corridor-contracted graph of a maze for repeated shortest-path queries
+
+    Nodes are the open cells whose number of open neighbors is not 2
+    (junctions and dead ends). Every corridor between two nodes becomes one
+    edge weighted by its length in steps. Building is one O(cells) pass.
+    Perfect mazes give a tree, and queries just climb parent links to the
+    common ancestor; braided mazes run Dijkstra over the nodes. Either way
+    corridors are walked cell by cell only for the returned path. The maze
+    must not change after the graph is built.
+    """
+
+    def __init__(self, maze):
+        if not isinstance(maze, MazeGrid):
+            maze = MazeGrid.from_rows(maze)
+        self.maze = maze
+        cells, width, pad = _walled_cells(maze)
+        self.cells = cells
+        self.width = width
+        self.pad = pad
+        self.offsets = offsets = (width, 1, -width, -1)
+        self.settled = []
+
+        # node_id[cell] -> position in node_cells / adjacency
+        self.node_id = node_id = {}
+        self.node_cells = node_cells = []
+        for cell in range(width, len(cells) - width):
+            if cells[cell] == 0:
+                degree = ((cells[cell + width] == 0) + (cells[cell + 1] == 0) +
+                          (cells[cell - width] == 0) + (cells[cell - 1] == 0))
+                if degree != 2:
+                    node_id[cell] = len(node_cells)
+                    node_cells.append(cell)
+
+        # adjacency[n] holds (neighbor node, steps, first corridor cell);
+        # each corridor is walked from both ends, so each side stores its own
+        self.adjacency = adjacency = [[] for _ in node_cells]
+        self.edge_count = 0
+        for a, cell in enumerate(node_cells):
+            for offset in offsets:
+                first = cell + offset
+                if cells[first] != 0:
+                    continue
+                end, steps = self._walk(cell, first)
+                if end is None or end == cell:
+                    continue  # corridor loops back to its own node
+                adjacency[a].append((node_id[end], steps, first))
+                if cell < end:
+                    self.edge_count += 1
+
+        self._build_forest()
+
+    def _build_forest(self):
+        """Root every component and check whether the graph is a forest
+
+        Fills tree_parent / tree_depth / tree_dist / tree_root per node,
+        plus the first corridor cell from each node up to its parent and
+        from the parent down to it.
+        """
+        adjacency = self.adjacency
+        count = len(adjacency)
+        self.tree_parent = parent = _index_array(count, -1)
+        self.tree_depth = depth = _index_array(count)
+        self.tree_dist = dist = _index_array(count)
+        self.tree_root = root = _index_array(count, -1)
+        self.up_first = up_first = _index_array(count, -1)
+        self.down_first = down_first = _index_array(count, -1)
+
+        components = 0
+        for start in range(count):
+            if root[start] >= 0:
+                continue
+            components += 1
+            root[start] = start
+            queue = [start]
+            for node in queue:
+                for nbr, steps, first in adjacency[node]:
+                    if root[nbr] < 0:
+                        root[nbr] = start
+                        parent[nbr] = node
+                        depth[nbr] = depth[node] + 1
+                        dist[nbr] = dist[node] + steps
+                        down_first[nbr] = first
+                        queue.append(nbr)
+                    elif nbr == parent[node] and up_first[node] < 0:
+                        up_first[node] = first
+
+        self.is_forest = self.edge_count == count - components
+
+    def _walk(self, prev, cell, stop=None):
+        """Follow a corridor from prev into cell until a node (or `stop`)
+
+        Returns (cell reached, steps taken). The cell is None if the walk
+        came back around to where it started without meeting a node.
+        """
+        cells, node_id, offsets = self.cells, self.node_id, self.offsets
+        origin = prev
+        steps = 1
+        while cell not in node_id and cell != stop:
+            for offset in offsets:
+                nxt = cell + offset
+                if cells[nxt] == 0 and nxt != prev:
+                    break
+            prev, cell = cell, nxt
+            steps += 1
+            if cell == origin:
+                return None, steps
+        return cell, steps
+
+    def _corridor(self, prev, cell, stop=None):
+        """Cells from `cell` up to the next node (or `stop`), inclusive"""
+        cells, node_id, offsets = self.cells, self.node_id, self.offsets
+        path = [cell]
+        while cell not in node_id and cell != stop:
+            for offset in offsets:
+                nxt = cell + offset
+                if cells[nxt] == 0 and nxt != prev:
+                    break
+            prev, cell = cell, nxt
+            path.append(cell)
+        return path
+
+    def _attach(self, cell, other):
+        """Ways to leave `cell` into the node graph
+
+        Returns (exits, direct): exits is a list of (node, steps, first
+        cell) and direct is the step count to `other` if it lies on the same
+        corridor. A cell on a ring with no node at all has no exits.
+        """
+        if cell in self.node_id:
+            return [(self.node_id[cell], 0, None)], None
+        exits = []
+        direct = None
+        for offset in self.offsets:
+            first = cell + offset
+            if self.cells[first] != 0:
+                continue
+            end, steps = self._walk(cell, first, stop=other)
+            if end == other:
+                if direct is None or steps < direct:
+                    direct = steps
+                # The corridor may continue past `other` to a node
+                end, steps = self._walk(cell, first)
+            if end is not None:
+                exits.append((self.node_id[end], steps, first))
+        return exits, direct
+
+    def _tree_route(self, a, b):
+        """Length and node chain of the unique tree path from node a to b"""
+        parent, depth = self.tree_parent, self.tree_depth
+        up, down = [a], [b]
+        while depth[a] > depth[b]:
+            a = parent[a]
+            up.append(a)
+        while depth[b] > depth[a]:
+            b = parent[b]
+            down.append(b)
+        while a != b:
+            a = parent[a]
+            up.append(a)
+            b = parent[b]
+            down.append(b)
+        dist = self.tree_dist
+        length = dist[up[0]] + dist[down[0]] - 2 * dist[a]
+        return length, up + down[-2::-1]
+
+    def _edge_first(self, a, b):
+        """First corridor cell from node a towards adjacent node b"""
+        if self.tree_parent[a] == b:
+            return self.up_first[a]
+        return self.down_first[b]
+
+    def _search(self, source, target):
+        """Shortest route from source to target; returns (steps, route) or None
+
+        route is None when source == target, ('direct',) for a walk along a
+        single corridor, or ('graph', firsts, chain, target first) where
+        chain is the node path and firsts[i] is the first corridor cell
+        leading into chain[i] (None where there is no corridor to walk).
+        """
+        cells = self.cells
+        self.settled = []
+        if cells[source] != 0 or cells[target] != 0:
+            return None
+        if source == target:
+            return 0, None
+
+        source_exits, direct = self._attach(source, target)
+        target_exits, _ = self._attach(target, source)
+
+        best = None
+        if direct is not None:
+            best = (direct, ('direct',))
+
+        if self.is_forest:
+            root = self.tree_root
+            for a, a_steps, a_first in source_exits:
+                for b, b_steps, b_first in target_exits:
+                    if root[a] != root[b]:
+                        continue
+                    length, chain = self._tree_route(a, b)
+                    total = a_steps + length + b_steps
+                    if best is None or total < best[0]:
+                        firsts = [a_first]
+                        for prev, node in zip(chain, chain[1:]):
+                            firsts.append(self._edge_first(prev, node))
+                        best = (total, ('graph', firsts, chain, b_first))
+            self.settled = [] if best is None or best[1][0] == 'direct' else best[1][2]
+            return best
+
+        # How each node reaches the target: node -> (steps, exit)
+        to_target = {}
+        for node, steps, first in target_exits:
+            if node not in to_target or steps < to_target[node][0]:
+                to_target[node] = (steps, first)
+
+        dist = {}
+        parent = {}
+        heap = []
+        for node, steps, first in source_exits:
+            if node not in dist or steps < dist[node]:
+                dist[node] = steps
+                parent[node] = (None, first)
+                heapq.heappush(heap, (steps, node))
+
+        adjacency = self.adjacency
+        settled = self.settled
+        found = None
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            if best is not None and d >= best[0]:
+                break
+            settled.append(node)
+            if node in to_target:
+                total = d + to_target[node][0]
+                if best is None or total < best[0]:
+                    best = (total, None)
+                    found = node
+            for nbr, steps, first in adjacency[node]:
+                nd = d + steps
+                if nbr not in dist or nd < dist[nbr]:
+                    dist[nbr] = nd
+                    parent[nbr] = (node, first)
+                    heapq.heappush(heap, (nd, nbr))
+
+        if best is None or best[1] is not None:
+            return best
+        chain = [found]
+        while parent[chain[-1]][0] is not None:
+            chain.append(parent[chain[-1]][0])
+        chain.reverse()
+        firsts = [parent[node][1] for node in chain]
+        return best[0], ('graph', firsts, chain, to_target[found][1])
+
+    def settled_points(self):
+        """Junction cells settled by the last query, as (x, y) tuples"""
+        return _to_points([self.node_cells[n] for n in self.settled],
+                          self.width, self.pad)
+
+    def distance(self, source, target):
+        """Shortest number of steps from source to target, or None"""
+        result = self._search(_to_index(source, self.width, self.pad),
+                              _to_index(target, self.width, self.pad))
+        return None if result is None else result[0]
+
+    def shortest_path(self, source, target):
+        """Shortest path from source to target as (x, y) tuples, or None"""
+        width, pad = self.width, self.pad
+        s = _to_index(source, width, pad)
+        t = _to_index(target, width, pad)
+        result = self._search(s, t)
+        if result is None:
+            return None
+        steps, route = result
+        if route is None:
+            return [source]
+
+        if route[0] == 'direct':
+            # Same corridor: walk towards the target from whichever side hits it
+            for offset in self.offsets:
+                first = s + offset
+                if self.cells[first] == 0:
+                    corridor = self._corridor(s, first, stop=t)
+                    if corridor[-1] == t and len(corridor) == steps:
+                        return _to_points([s] + corridor, width, pad)
+
+        _, firsts, chain, target_first = route
+        node_cells = self.node_cells
+        path = [s]
+        prev_cell = s
+        for node, first in zip(chain, firsts):
+            if first is not None:
+                path.extend(self._corridor(prev_cell, first, stop=node_cells[node]))
+            prev_cell = node_cells[node]
+        if target_first is not None:
+            # Walk from the target back to the last node, then reverse it
+            back = self._corridor(t, target_first, stop=node_cells[chain[-1]])
+            back.reverse()
+            path.extend(back[1:])
+            path.append(t)
+        return _to_points(path, width, pad)
+
+
+class LandmarkRouter:
+    """Point-to-point routes between any two cells of a fixed maze
+
+    A few landmark cells are picked far apart and a BFS distance table is
+    stored for each (4 bytes per cell per landmark). By the triangle
+    inequality |d(L, target) - d(L, cell)| never overestimates the distance
+    from cell to target, so A* with the best landmark bound expands far
+    fewer cells than plain Manhattan distance does in a maze (ALT search).
+
+    Sources asked for at least `cache_after` times get a full BFS parent
+    tree, kept in an LRU cache limited to `cache_bytes`; later routes from
+    them are read straight off the tree. The maze must not change after
+    the router is built.
+    """
+
+    def __init__(self, maze, landmarks=4, cache_bytes=64 * 1024 * 1024,
+                 cache_after=2):
+        if not isinstance(maze, MazeGrid):
+            maze = MazeGrid.from_rows(maze)
+        self.maze = maze
+        self.cells, self.width, self.pad = _walled_cells(maze)
+        self.cache_bytes = cache_bytes
+        self.cache_after = cache_after
+        self.trees = OrderedDict()  # source cell -> BFS parent array
+        self.source_hits = {}
+        self.last_expanded = 0
+
+        # Farthest-point landmarks: each new one is the last cell reached
+        # by a BFS from all landmarks chosen so far
+        self.landmarks = []
+        self.tables = []
+        first = self.cells.find(PATH)
+        if first < 0:
+            return
+        _, far = _bfs_distances(self.cells, self.width, [first])
+        while len(self.landmarks) < landmarks and far not in self.landmarks:
+            self.landmarks.append(far)
+            table, _ = _bfs_distances(self.cells, self.width, [far])
+            self.tables.append(table)
+            _, far = _bfs_distances(self.cells, self.width, self.landmarks)
+
+    @property
+    def cached_bytes(self):
+        return sum(tree.itemsize * len(tree) for tree in self.trees.values())
+
+    def _tree(self, source):
+        """Cached BFS parent tree for source, building it if it's popular"""
+        tree = self.trees.get(source)
+        if tree is not None:
+            self.trees.move_to_end(source)
+            return tree
+
+        hits = self.source_hits.get(source, 0) + 1
+        if len(self.source_hits) > 100000:
+            self.source_hits.clear()
+        self.source_hits[source] = hits
+        tree_bytes = 4 * len(self.cells)
+        if hits < self.cache_after or tree_bytes > self.cache_bytes:
+            return None
+
+        tree = _bfs_parents(self.cells, self.width, source)
+        self.trees[source] = tree
+        while self.cached_bytes > self.cache_bytes:
+            self.trees.popitem(last=False)
+        return tree
+
+    def route(self, source, target):
+        """Shortest path from source to target as (x, y) tuples, or None"""
+        width, pad, cells = self.width, self.pad, self.cells
+        s = _to_index(source, width, pad)
+        t = _to_index(target, width, pad)
+        self.last_expanded = 0
+        if cells[s] != 0 or cells[t] != 0:
+            return None
+
+        tree = self._tree(s)
+        if tree is not None:
+            if tree[t] < 0:
+                return None
+            return _to_points(_trace(tree, t), width, pad)
+
+        path = self._astar(s, t)
+        return None if path is None else _to_points(path, width, pad)
+
+    def distance(self, source, target):
+        """Shortest number of steps from source to target, or None"""
+        path = self.route(source, target)
+        return None if path is None else len(path) - 1
+
+    def _astar(self, start, end):
+        cells = self.cells
+        size = len(cells)
+        offsets = (self.width, 1, -self.width, -1)
+
+        # Landmark distances to the target; a landmark that reaches only
+        # one of the two cells proves there is no route
+        bounds = []
+        for table in self.tables:
+            to_end = table[end]
+            if (to_end < 0) != (table[start] < 0):
+                return None
+            if to_end >= 0:
+                bounds.append((table, to_end))
+
+        def estimate(cell):
+            best = 0
+            for table, to_end in bounds:
+                gap = table[cell] - to_end
+                if gap < 0:
+                    gap = -gap
+                if gap > best:
+                    best = gap
+            return best
+
+        g_score = _index_array(size, -1)
+        closed = bytearray(size)
+        parent = _index_array(size)
+        g_score[start] = 0
+        parent[start] = start
+        # Single-int heap entries: f * size + cell
+        heap = [estimate(start) * size + start]
+        expanded = 0
+
+        while heap:
+            current = heapq.heappop(heap) % size
+            if closed[current]:
+                continue
+            closed[current] = 1
+            expanded += 1
+
+            if current == end:
+                self.last_expanded = expanded
+                return _trace(parent, current)
+
+            g = g_score[current] + 1
+            for offset in offsets:
+                neighbor = current + offset
+                if cells[neighbor] == 0 and not closed[neighbor]:
+                    old = g_score[neighbor]
+                    if old < 0 or g < old:
+                        g_score[neighbor] = g
+                        parent[neighbor] = current
+                        heapq.heappush(heap, (g + estimate(neighbor)) * size + neighbor)
+
+        self.last_expanded = expanded
+        return None
+
+
+class DynamicSolver:
+    """Shortest path between two cells of a maze whose walls change (D* Lite)
+
+    Distances to the goal are kept between queries. After set_wall() only
+    the cells whose distance actually changes are expanded again, so a few
+    toggled walls cost work in proportion to the area they affect instead
+    of a full search. The start may move too (move_start); the goal is
+    fixed. The solver searches its own padded copy of the cells and writes
+    every change through to `maze` as well.
+    """
+
+    def __init__(self, maze, start=None, end=None):
+        if not isinstance(maze, MazeGrid):
+            maze = MazeGrid.from_rows(maze)
+        self.maze = maze
+        self.start = start if start is not None else (1, 1)
+        self.end = end if end is not None else (maze.width - 2, maze.height - 2)
+        self.cells, self.width, self.pad = _walled_cells(maze, copy=True)
+        size = len(self.cells)
+        self.offsets = (self.width, 1, -self.width, -1)
+        # Longer than any path, so it doubles as "unreachable"
+        self.inf = size
+        self.g = _index_array(size, self.inf)
+        self.rhs = _index_array(size, self.inf)
+        # Heap entries pack (key, cell) into one int; keys pack (k1, k2).
+        # queued maps each cell in the queue to its live key, older heap
+        # entries for it are skipped when popped.
+        self.heap = []
+        self.queued = {}
+        self.km = 0
+        self.last_expanded = 0
+        self._goal = _to_index(self.end, self.width, self.pad)
+        self._set_start(self.start)
+        self._update(self._goal)
+
+    def _set_start(self, point):
+        self.start = point
+        self._start = _to_index(point, self.width, self.pad)
+        self._start_y, self._start_x = divmod(self._start, self.width)
+
+    def _queue(self, cell):
+        """Put cell in the queue under its current key, or drop it if consistent
+
+        The key is (min(g, rhs) + heuristic + km, min(g, rhs)) packed into
+        one int; the heuristic is the Manhattan distance to the start.
+        """
+        g, rhs = self.g[cell], self.rhs[cell]
+        if g == rhs:
+            self.queued.pop(cell, None)
+            return
+        best = g if g < rhs else rhs
+        y, x = divmod(cell, self.width)
+        h = abs(x - self._start_x) + abs(y - self._start_y)
+        key = (best + h + self.km) * (self.inf + 1) + best
+        self.queued[cell] = key
+        heapq.heappush(self.heap, key * len(self.cells) + cell)
+
+    def _update(self, cell):
+        """Recompute rhs (one-step lookahead distance) of cell and requeue it"""
+        cells, g, inf = self.cells, self.g, self.inf
+        if cells[cell] != 0:
+            self.rhs[cell] = inf
+        elif cell == self._goal:
+            self.rhs[cell] = 0
+        else:
+            best = inf
+            for offset in self.offsets:
+                neighbor = cell + offset
+                if cells[neighbor] == 0 and g[neighbor] < best:
+                    best = g[neighbor]
+            self.rhs[cell] = best + 1 if best < inf else inf
+        self._queue(cell)
+
+    def _compute(self):
+        """Expand inconsistent cells until the start's distance is settled"""
+        cells, g, rhs, inf = self.cells, self.g, self.rhs, self.inf
+        heap, queued, offsets = self.heap, self.queued, self.offsets
+        size = len(cells)
+        start, goal = self._start, self._goal
+        expanded = 0
+
+        while heap:
+            key, cell = divmod(heap[0], size)
+            if queued.get(cell) != key:
+                heapq.heappop(heap)  # stale entry
+                continue
+            # The start's own key: its heuristic is 0
+            best = min(g[start], rhs[start])
+            if key >= (best + self.km) * (inf + 1) + best and g[start] == rhs[start]:
+                break
+            heapq.heappop(heap)
+            del queued[cell]
+            expanded += 1
+
+            d = rhs[cell]
+            y, x = divmod(cell, self.width)
+            h = abs(x - self._start_x) + abs(y - self._start_y)
+            if key < (min(g[cell], d) + h + self.km) * (inf + 1) + min(g[cell], d):
+                # Start moved since it was queued; just reorder it
+                self._queue(cell)
+            elif g[cell] > d:
+                # Distance went down: neighbours may now go through cell
+                g[cell] = d
+                for offset in offsets:
+                    neighbor = cell + offset
+                    if cells[neighbor] == 0 and rhs[neighbor] > d + 1:
+                        rhs[neighbor] = d + 1
+                        self._queue(neighbor)
+            else:
+                # Distance went up: recheck cell and every neighbour that
+                # was relying on it
+                old = g[cell]
+                g[cell] = inf
+                self._update(cell)
+                for offset in offsets:
+                    neighbor = cell + offset
+                    if cells[neighbor] == 0 and neighbor != goal and rhs[neighbor] == old + 1:
+                        self._update(neighbor)
+
+        self.last_expanded = expanded
+
+    def set_wall(self, point, wall=True):
+        """Add (wall=True) or remove a wall at (x, y)"""
+        x, y = point
+        cell = _to_index(point, self.width, self.pad)
+        value = WALL if wall else PATH
+        if self.cells[cell] == value:
+            return
+        self.cells[cell] = value
+        self.maze.cells[y * self.maze.width + x] = value
+        self._update(cell)
+        for offset in self.offsets:
+            self._update(cell + offset)
+
+    def move_start(self, point):
+        """Move the start to (x, y), keeping everything computed so far"""
+        y, x = divmod(_to_index(point, self.width, self.pad), self.width)
+        self.km += abs(x - self._start_x) + abs(y - self._start_y)
+        self._set_start(point)
+
+    def distance(self):
+        """Steps from start to end, or None if there is no route"""
+        self._compute()
+        d = self.g[self._start]
+        return None if d >= self.inf else d
+
+    def route(self):
+        """Shortest path from start to end as (x, y) tuples, or None"""
+        if self.distance() is None:
+            return None
+        cells, g = self.cells, self.g
+        cell = self._start
+        path = [cell]
+        while cell != self._goal:
+            # Step to the open neighbour closest to the goal
+            cell = min((cell + offset for offset in self.offsets
+                        if cells[cell + offset] == 0),
+                       key=g.__getitem__)
+            path.append(cell)
+        return _to_points(path, self.width, self.pad)
+
+
+class BitWavefront:
+    """Breadth-first wavefront over bitboards, a whole layer at a time
+
+    The grid is cut into TILE x TILE tiles, each stored as one Python int
+    with a bit per cell (bit r * TILE + c). A BFS layer is found for a tile
+    with a handful of shifts and masks on its int, plus the edge rows and
+    columns of its neighbours' frontiers, and only tiles the frontier is in
+    are touched. That replaces the per-cell deque loop of solve_bfs with
+    big-int operations that each cover up to TILE * TILE cells.
+    """
+
+    TILE = 64
+
+    def __init__(self, cells, width, height):
+        B = self.TILE
+        self.width, self.height = width, height
+        self.tiles_x = (width + B - 1) // B
+        self.tiles_y = (height + B - 1) // B
+        self.full = (1 << (B * B)) - 1
+        self.col_first = sum(1 << (r * B) for r in range(B))
+        self.col_last = self.col_first << (B - 1)
+        self.row_first = (1 << B) - 1
+
+        # Open-cell bitboard of every tile: rows of '1' (open) / '0' (wall)
+        # text, reversed so cell 0 of the tile ends up as the lowest bit
+        to_bits = bytes.maketrans(b'\x00\x01', b'10')
+        pad = b'0' * (self.tiles_x * B - width)
+        self.open = []
+        for ty in range(self.tiles_y):
+            rows = [cells[y * width:(y + 1) * width].translate(to_bits) + pad
+                    for y in range(ty * B, min((ty + 1) * B, height))]
+            for tx in range(self.tiles_x):
+                text = b''.join([row[tx * B:(tx + 1) * B] for row in rows])
+                self.open.append(int(text[::-1], 2))
+
+    def locate(self, x, y):
+        """(tile number, bit number) of cell (x, y)"""
+        B = self.TILE
+        return (y // B) * self.tiles_x + x // B, (y % B) * B + x % B
+
+    def run(self, start, goal=None, exact=False):
+        """Spread from start until goal is reached (or everything, if goal is None)
+
+        Returns (distance to goal or None, reached, slices). reached holds
+        each tile's reached cells. With exact=False, slices has two boards
+        per tile marking cells whose distance mod 3 is 1 or 2; that is
+        enough to walk a path back. With exact=True, slices[t][k] marks
+        cells whose distance has bit k set.
+        """
+        B, tiles_x = self.TILE, self.tiles_x
+        last_tile = len(self.open) - 1
+        not_first, not_last = self.full ^ self.col_first, self.full ^ self.col_last
+        col_first, col_last, row_first = self.col_first, self.col_last, self.row_first
+        bottom = B * (B - 1)
+
+        remaining = list(self.open)
+        slices = [[] for _ in remaining]
+        tile, bit = self.locate(*start)
+        frontier = {tile: 1 << bit}
+        remaining[tile] &= ~(1 << bit)
+        goal_tile, goal_bit = self.locate(*goal) if goal is not None else (-1, 0)
+        if goal is not None and goal == start:
+            return 0, self._reached(remaining, start), slices
+
+        distance = 0
+        while frontier:
+            distance += 1
+            # Shift each frontier tile within itself; cells on its edges
+            # also spread into the neighbouring tile's opposite edge
+            spreads = {}
+            for t, f in frontier.items():
+                spreads[t] = spreads.get(t, 0) | (((f << 1) & not_first) | ((f >> 1) & not_last) |
+                                                  (f << B) | (f >> B))
+                edge = f & col_first
+                if edge and t % tiles_x:
+                    spreads[t - 1] = spreads.get(t - 1, 0) | (edge << (B - 1))
+                edge = f & col_last
+                if edge and (t + 1) % tiles_x:
+                    spreads[t + 1] = spreads.get(t + 1, 0) | (edge >> (B - 1))
+                edge = f & row_first
+                if edge and t >= tiles_x:
+                    spreads[t - tiles_x] = spreads.get(t - tiles_x, 0) | (edge << bottom)
+                edge = f >> bottom
+                if edge and t + tiles_x <= last_tile:
+                    spreads[t + tiles_x] = spreads.get(t + tiles_x, 0) | edge
+
+            layer = {}
+            for t, spread in spreads.items():
+                spread &= remaining[t]
+                if not spread:
+                    continue
+                remaining[t] ^= spread
+                layer[t] = spread
+
+                # Record the layer's distance in the tile's bit slices
+                tile_slices = slices[t]
+                if exact:
+                    while len(tile_slices) < distance.bit_length():
+                        tile_slices.append(0)
+                    k, d = 0, distance
+                    while d:
+                        if d & 1:
+                            tile_slices[k] |= spread
+                        k, d = k + 1, d >> 1
+                else:
+                    if not tile_slices:
+                        tile_slices.extend((0, 0))
+                    m = distance % 3
+                    if m:
+                        tile_slices[m - 1] |= spread
+
+            frontier = layer
+            if layer.get(goal_tile, 0) >> goal_bit & 1:
+                return distance, self._reached(remaining, start), slices
+        return None, self._reached(remaining, start), slices
+
+    def _reached(self, remaining, start):
+        reached = [o ^ r for o, r in zip(self.open, remaining)]
+        tile, bit = self.locate(*start)
+        reached[tile] |= 1 << bit
+        return reached
+
+    def trace(self, start, goal, distance, reached, slices, exact=False):
+        """Walk back from goal to start along cells one step closer each time
+
+        Neighbour distances differ by at most one, so distance mod 3 (or
+        the exact distance) tells which neighbour is one step closer.
+        """
+        path = [goal]
+        x, y = goal
+        for d in range(distance - 1, -1, -1):
+            want = d if exact else d % 3
+            for nx, ny in ((x, y + 1), (x + 1, y), (x, y - 1), (x - 1, y)):
+                if not (0 <= nx < self.width and 0 <= ny < self.height):
+                    continue
+                tile, bit = self.locate(nx, ny)
+                if not reached[tile] >> bit & 1:
+                    continue
+                value = 0
+                for k, board in enumerate(slices[tile]):
+                    value |= (board >> bit & 1) << k
+                if value == want and (d or (nx, ny) == start):
+                    x, y = nx, ny
+                    break
+            path.append((x, y))
+        path.reverse()
+        return path
+
+    def field(self, reached, slices):
+        """Flat array('i') of distances, y * width + x, -1 where unreached
+
+        Per tile, each bit slice becomes one byte per cell (bytes.translate).
+        Up to 8 slices added as shifted ints make one byte of every distance
+        at once, and strided slice assignment interleaves the four bytes of
+        each int, so no Python code runs per cell.
+        """
+        B, width = self.TILE, self.width
+        size = B * B
+        as_bits = bytes.maketrans(b'01', b'\x00\x01')
+        as_unset = bytes.maketrans(b'01', b'\xff\x00')
+
+        def per_cell(board, table):
+            return bin(board)[2:].zfill(size)[::-1].encode('ascii').translate(table)
+
+        result = _index_array(width * self.height, -1)
+        for t, tile_slices in enumerate(slices):
+            if not reached[t]:
+                continue
+            unset = per_cell(reached[t], as_unset)
+            unset_lanes = int.from_bytes(unset, 'little')
+            data = bytearray(4 * size)
+            for j in range(4):
+                part = 0
+                for k, board in enumerate(tile_slices[8 * j:8 * j + 8]):
+                    if board:
+                        part |= int.from_bytes(per_cell(board, as_bits), 'little') << k
+                data[j::4] = (part | unset_lanes).to_bytes(size, 'little') if part else unset
+            values = array('i')
+            values.frombytes(data)
+            if sys.byteorder == 'big':
+                values.byteswap()
+
+            ty, tx = divmod(t, self.tiles_x)
+            x0 = tx * B
+            span = min(B, width - x0)
+            for r in range(min(B, self.height - ty * B)):
+                row = (ty * B + r) * width + x0
+                result[row:row + span] = values[r * B:r * B + span]
+        return result
+
+
+def advance(job, steps):
+    """Run a step iterator (iter_generate, iter_dfs, iter_bfs) for at most `steps` events
+
+    Returns (events, finished). Call again with the same job to resume;
+    job.close() cancels it.
+    """
+    events = list(islice(job, steps))
+    return events, len(events) < steps
+
+
+def _walled_cells(maze, points=(), copy=False):
+    """Return (cells, width, pad) with a ring of walls around every open cell
+
+    The flat-index searches step by fixed offsets (+-1, +-width) with no
+    bounds checks, which is safe when every open cell (and every point in
+    `points`) is off the border. Generated mazes always are; anything else
+    is searched on a copy padded with one ring of walls (pad = 1). With
+    copy=True the padded copy is always made, for callers that edit it.
+    """
+    cells, width, height = maze.cells, maze.width, maze.height
+    walled = (PATH not in cells[:width] and
+              PATH not in cells[-width:] and
+              PATH not in cells[::width] and
+              PATH not in cells[width - 1::width])
+    for x, y in points:
+        if not (0 < x < width - 1 and 0 < y < height - 1):
+            walled = False
+    if walled and not copy:
+        return cells, width, 0
+
+    padded = MazeGrid(width + 2, height + 2)
+    for y in range(height):
+        row = (y + 1) * (width + 2) + 1
+        padded.cells[row:row + width] = cells[y * width:(y + 1) * width]
+    return padded.cells, width + 2, 1
+
+
+def _bfs_distances(cells, width, sources):
+    """BFS step counts from the nearest of `sources`, -1 where unreachable
+
+    Returns (table, last cell reached); the last cell is a farthest one.
+    """
+    dist = _index_array(len(cells), -1)
+    offsets = (width, 1, -width, -1)
+    queue = array('i', sources)
+    for source in sources:
+        dist[source] = 0
+    for current in queue:
+        d = dist[current] + 1
+        for offset in offsets:
+            neighbor = current + offset
+            if cells[neighbor] == 0 and dist[neighbor] < 0:
+                dist[neighbor] = d
+                queue.append(neighbor)
+    return dist, queue[-1]
+
+
+def _bfs_parents(cells, width, source):
+    """Full BFS tree from source as a parent array (-1 where unreachable)"""
+    parent = _index_array(len(cells), -1)
+    offsets = (width, 1, -width, -1)
+    queue = array('i', [source])
+    parent[source] = source
+    for current in queue:
+        for offset in offsets:
+            neighbor = current + offset
+            if cells[neighbor] == 0 and parent[neighbor] < 0:
+                parent[neighbor] = current
+                queue.append(neighbor)
+    return parent
+
+
+def _index_array(size, fill=0):
+    """Flat int array with one slot per cell (4 bytes each for normal sizes)"""
+    return array('i' if size < 2 ** 31 else 'q', [fill]) * size
+
+
+def _to_index(point, width, pad=0):
+    x, y = point
+    return (y + pad) * width + x + pad
+
+
+def _to_points(indices, width, pad=0):
+    """Convert flat indices back to (x, y) tuples"""
+    return [(i % width - pad, i // width - pad) for i in indices]
+
+
+def _trace(parent, cell):
+    """Follow parent links back to the root (a cell that is its own parent)"""
+    path = [cell]
+    while parent[cell] != cell:
+        cell = parent[cell]
+        path.append(cell)
+    path.reverse()
+    return path
 
 
 def demonstrate_maze_system():
@@ -351,6 +2340,150 @@ def test_algorithms():
         
         if dfs_solution and bfs_solution:
             print(f"BFS optimal: {'✓' if len(bfs_solution) <= len(dfs_solution) else '✗'}")
+        
+        # The other shortest-path solvers must match the BFS length
+        for name, solve in (("A*", solver.solve_astar),
+                            ("Bidirectional", solver.solve_bidirectional),
+                            ("Junction graph", solver.solve_graph),
+                            ("Wavefront", solver.solve_wavefront)):
+            solution, path = solve()
+            optimal = solution and bfs_solution and len(solution) == len(bfs_solution)
+            print(f"{name}: {'✓' if optimal else '✗'} "
+                  f"({len(solution) if solution else 0} steps, "
+                  f"{len(path)} explored)")
+    
+    # Compare grid storage
+    memory = measure_grid_memory()
+    print(f"\nGrid memory: list-of-lists {memory['list_of_lists']:.2f} bytes/cell, "
+          f"MazeGrid {memory['maze_grid']:.2f} bytes/cell")
+
+
+def task_seed(seed, index):
+    """Seed for task `index` of a batch; depends only on (seed, index)"""
+    return f"{seed}:{index}"
+
+
+def generate_and_solve(task):
+    """Generate and solve one maze; task is (index, width, height, seed)
+
+    Runs in a worker process, so it only takes and returns plain data.
+    Everything random comes from one random.Random seeded from the task.
+    """
+    index, width, height, seed = task
+    rng = random.Random(task_seed(seed, index))
+
+    start = time.perf_counter()
+    generator = MazeGenerator(width, height, rng=rng)
+    maze = generator.generate_maze()
+    maze.seed = task_seed(seed, index)
+    generate_time = time.perf_counter() - start
+
+    solver = MazeSolver(maze, rng=rng)
+    start = time.perf_counter()
+    dfs_solution, dfs_path = solver.solve_dfs()
+    dfs_time = time.perf_counter() - start
+    start = time.perf_counter()
+    bfs_solution, bfs_path = solver.solve_bfs()
+    bfs_time = time.perf_counter() - start
+
+    return {
+        'index': index,
+        'width': generator.width,
+        'height': generator.height,
+        'checksum': zlib.crc32(maze.cells),
+        'dfs_steps': len(dfs_solution) if dfs_solution else 0,
+        'dfs_explored': len(dfs_path),
+        'bfs_steps': len(bfs_solution) if bfs_solution else 0,
+        'bfs_explored': len(bfs_path),
+        'generate_time': generate_time,
+        'dfs_time': dfs_time,
+        'bfs_time': bfs_time,
+    }
+
+
+def run_batch(sizes, count, seed=0, workers=None):
+    """Generate and solve `count` mazes per size across a process pool
+
+    sizes is a list of (width, height). Task i always gets the same seed,
+    so the mazes and solutions don't depend on the number of workers.
+    Returns (results in task order, aggregate statistics).
+    """
+    tasks = []
+    for width, height in sizes:
+        for _ in range(count):
+            tasks.append((len(tasks), width, height, seed))
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = [generate_and_solve(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1)))
+            results = list(pool.map(generate_and_solve, tasks, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    return results, aggregate_results(results, elapsed)
+
+
+def aggregate_results(results, elapsed):
+    """Summarise batch results overall and per maze size"""
+    by_size = {}
+    for result in results:
+        by_size.setdefault(f"{result['width']}x{result['height']}", []).append(result)
+
+    def summarise(group):
+        n = len(group)
+        return {
+            'mazes': n,
+            'solved': sum(1 for r in group if r['bfs_steps']),
+            'mean_bfs_steps': sum(r['bfs_steps'] for r in group) / n,
+            'mean_dfs_steps': sum(r['dfs_steps'] for r in group) / n,
+            'mean_bfs_explored': sum(r['bfs_explored'] for r in group) / n,
+            'mean_dfs_explored': sum(r['dfs_explored'] for r in group) / n,
+            'mean_generate_time': sum(r['generate_time'] for r in group) / n,
+            'mean_dfs_time': sum(r['dfs_time'] for r in group) / n,
+            'mean_bfs_time': sum(r['bfs_time'] for r in group) / n,
+        }
+
+    stats = summarise(results) if results else {'mazes': 0}
+    stats['elapsed'] = elapsed
+    stats['mazes_per_second'] = len(results) / elapsed if elapsed else 0.0
+    stats['sizes'] = {size: summarise(group) for size, group in by_size.items()}
+    return stats
+
+
+def parse_size(text):
+    """Parse '51' or '51x101' into (width, height)"""
+    width, _, height = text.lower().partition('x')
+    return int(width), int(height or width)
+
+
+def batch_main(argv=None):
+    """Command line batch mode: python Maze.py batch --size 101 --count 50"""
+    parser = argparse.ArgumentParser(prog="Maze.py batch",
+                                     description="Generate and solve many mazes in parallel")
+    parser.add_argument('--size', action='append', type=parse_size,
+                        help="maze size as N or WxH (repeatable, default 21)")
+    parser.add_argument('--count', type=int, default=10, help="mazes per size")
+    parser.add_argument('--seed', type=int, default=0, help="batch seed")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument('--json', action='store_true', help="print statistics as JSON")
+    args = parser.parse_args(argv)
+
+    results, stats = run_batch(args.size or [(21, 21)], args.count,
+                               seed=args.seed, workers=args.workers)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return stats
+
+    print(f"🧩 {stats['mazes']} mazes in {stats['elapsed']:.2f}s "
+          f"({stats['mazes_per_second']:.1f} mazes/s)")
+    for size, group in stats['sizes'].items():
+        print(f"{size}: {group['solved']}/{group['mazes']} solved, "
+              f"BFS {group['mean_bfs_steps']:.1f} steps / {group['mean_bfs_explored']:.1f} explored, "
+              f"DFS {group['mean_dfs_steps']:.1f} steps / {group['mean_dfs_explored']:.1f} explored")
+    return stats
 
 
 def main():
@@ -387,4 +2520,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if sys.argv[1:2] == ["batch"]:
+        batch_main(sys.argv[2:])
+    else:
+        main()
\ No newline at end of file
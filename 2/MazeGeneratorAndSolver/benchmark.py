@@ -0,0 +1,341 @@
+"""Benchmark maze generation and solving across sizes
+
+Times MazeGenerator.generate_maze and every MazeSolver solver from small
+grids up to 4001x4001, recording wall time, peak traced memory and cells
+expanded per second. Results are written as JSON; pass --compare with an
+older results file to flag regressions. --engines also compares every
+generation engine: throughput, dead ends and BFS solution length.
+--dynamic times DynamicSolver repairs against a full solve_bfs after
+every batch of wall changes. --wavefront compares the bitboard wavefront
+with solve_bfs on open, braided and perfect grids.
+
+    python benchmark.py --out results.json
+    python benchmark.py --sizes 101 501 --compare results.json
+    python benchmark.py --sizes 501 1001 --engines
+    python benchmark.py --sizes 1001 --dynamic
+    python benchmark.py --sizes 2001 --wavefront
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from Maze import (ENGINES, SOLVERS, DynamicSolver, MazeGenerator, MazeGrid, MazeSolver,
+                  _bfs_distances, _walled_cells)
+
+DEFAULT_SIZES = [51, 101, 251, 501, 1001, 2001, 4001]
+
+def measure(func, repeat=1):
+    """Time func (fastest of `repeat` untraced runs), then one traced run for memory
+
+    tracemalloc slows allocation-heavy code a lot, so timings never come
+    from the traced run. Returns (result, wall seconds, peak traced bytes).
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def benchmark_size(size, seed=0, repeat=1, solvers=SOLVERS):
+    """Benchmark generation and each solver on one size x size maze"""
+    def generate():
+        return MazeGenerator(size, size, rng=random.Random(seed)).generate_maze()
+
+    maze, elapsed, peak = measure(generate, repeat)
+    cells = maze.width * maze.height
+    entry = {
+        'generate': {
+            'time': elapsed,
+            'peak_bytes': peak,
+            'cells_per_second': cells / elapsed if elapsed else 0.0,
+        }
+    }
+
+    for name in solvers:
+        # A fresh solver per run, so graph and route solvers pay for their index
+        def solve():
+            solver = MazeSolver(maze, rng=random.Random(seed))
+            solution, _ = solver.solve(name)
+            return solution, solver.stats.expanded
+
+        (solution, expanded), elapsed, peak = measure(solve, repeat)
+        entry[name] = {
+            'time': elapsed,
+            'peak_bytes': peak,
+            'expanded': expanded,
+            'solution_length': len(solution) if solution else 0,
+            'cells_per_second': expanded / elapsed if elapsed else 0.0,
+        }
+    return entry
+
+
+def count_dead_ends(maze):
+    """Open cells with exactly one open neighbour"""
+    cells, width = maze.cells, maze.width
+    dead_ends = 0
+    for y in range(1, maze.height - 1):
+        row = y * width
+        for i in range(row + 1, row + width - 1):
+            if cells[i] == 0 and (cells[i - 1] + cells[i + 1] +
+                                  cells[i - width] + cells[i + width]) == 3:
+                dead_ends += 1
+    return dead_ends
+
+
+def benchmark_engines(size, seed=0, repeat=1, engines=ENGINES):
+    """Compare generation engines on one size x size maze"""
+    entry = {}
+    for name in engines:
+        def generate():
+            return MazeGenerator(size, size, rng=random.Random(seed),
+                                 algorithm=name).generate_maze()
+
+        maze, elapsed, peak = measure(generate, repeat)
+        solution, _ = MazeSolver(maze, record_path=False).solve_bfs()
+        entry[name] = {
+            'time': elapsed,
+            'peak_bytes': peak,
+            'cells_per_second': maze.width * maze.height / elapsed if elapsed else 0.0,
+            'dead_ends': count_dead_ends(maze),
+            'solution_length': len(solution) if solution else 0,
+        }
+    return entry
+
+
+def benchmark_dynamic(size, seed=0, ticks=50, changes=4):
+    """Per-tick DynamicSolver repair vs a full solve_bfs on a changing maze
+
+    The maze is braided first: in a perfect maze almost any toggled wall
+    cuts the only route, so nearly every tick would have no route at all.
+    Each tick toggles `changes` random walls between cells, then asks both
+    solvers for the route length; they must agree. Ticks without a route
+    are counted.
+    """
+    rng = random.Random(seed)
+    maze = braid(MazeGenerator(size, size, rng=rng).generate_maze(), rng)
+    start = time.perf_counter()
+    dynamic = DynamicSolver(maze)
+    dynamic.distance()
+    entry = {'initial_time': time.perf_counter() - start,
+             'initial_expanded': dynamic.last_expanded}
+
+    dynamic_times, bfs_times, expanded = [], [], []
+    no_route = 0
+    for _ in range(ticks):
+        for _ in range(changes):
+            # A wall slot between two cells: odd x, even y or even x, odd y
+            x = rng.randrange(1, maze.width - 1)
+            y = rng.randrange(1 + x % 2, maze.height - 1, 2)
+            dynamic.set_wall((x, y), wall=not maze.cells[y * maze.width + x])
+
+        start = time.perf_counter()
+        distance = dynamic.distance()
+        dynamic_times.append(time.perf_counter() - start)
+        expanded.append(dynamic.last_expanded)
+
+        start = time.perf_counter()
+        solution, _ = MazeSolver(maze, record_path=False).solve_bfs()
+        bfs_times.append(time.perf_counter() - start)
+        if (None if solution is None else len(solution) - 1) != distance:
+            raise AssertionError("DynamicSolver disagrees with solve_bfs")
+        no_route += distance is None
+
+    entry.update({
+        'ticks': ticks,
+        'changes_per_tick': changes,
+        'no_route_ticks': no_route,
+        'mean_tick_time': sum(dynamic_times) / ticks,
+        'median_tick_time': sorted(dynamic_times)[ticks // 2],
+        'max_tick_time': max(dynamic_times),
+        'mean_tick_expanded': sum(expanded) / ticks,
+        'mean_bfs_time': sum(bfs_times) / ticks,
+    })
+    return entry
+
+
+def open_grid(size):
+    """size x size grid with walls only around the border"""
+    grid = MazeGrid(size, size, fill=0)
+    grid.cells[:size] = grid.cells[-size:] = bytes([1]) * size
+    grid.cells[::size] = grid.cells[size - 1::size] = bytes([1]) * size
+    return grid
+
+
+def braid(maze, rng):
+    """Remove every dead end of a generated maze by opening one more wall"""
+    cells, width, height = maze.cells, maze.width, maze.height
+    steps = ((1, 0), (-1, 0), (0, 1), (0, -1))
+    for y in range(1, height - 1, 2):
+        for x in range(1, width - 1, 2):
+            walls = [(dx, dy) for dx, dy in steps if cells[(y + dy) * width + x + dx]]
+            if len(walls) == 3:
+                # Only walls with another cell behind them, not the border
+                inner = [(dx, dy) for dx, dy in walls
+                         if 0 < x + 2 * dx < width - 1 and 0 < y + 2 * dy < height - 1]
+                dx, dy = rng.choice(inner)
+                cells[(y + dy) * width + x + dx] = 0
+    return maze
+
+
+def benchmark_wavefront(size, seed=0, repeat=1):
+    """solve_wavefront vs solve_bfs, and distance_field vs a full BFS, per grid kind"""
+    rng = random.Random(seed)
+    grids = {
+        'open': open_grid(size),
+        'braided': braid(MazeGenerator(size, size, rng=rng).generate_maze(), rng),
+        'perfect': MazeGenerator(size, size, rng=rng).generate_maze(),
+    }
+    entry = {}
+    for name, maze in grids.items():
+        solver = MazeSolver(maze, record_path=False)
+        (bfs, _), bfs_time, _ = measure(solver.solve_bfs, repeat)
+        (wave, _), wave_time, _ = measure(solver.solve_wavefront, repeat)
+        if len(bfs) != len(wave):
+            raise AssertionError("solve_wavefront disagrees with solve_bfs")
+
+        def bfs_field():
+            cells, width, pad = _walled_cells(maze)
+            return _bfs_distances(cells, width, [(1 + pad) * width + 1 + pad])
+
+        _, bfs_field_time, _ = measure(bfs_field, repeat)
+        _, field_time, _ = measure(solver.distance_field, repeat)
+        entry[name] = {
+            'solution_length': len(bfs),
+            'bfs_time': bfs_time,
+            'wavefront_time': wave_time,
+            'speedup': bfs_time / wave_time if wave_time else 0.0,
+            'bfs_field_time': bfs_field_time,
+            'field_time': field_time,
+            'field_speedup': bfs_field_time / field_time if field_time else 0.0,
+        }
+    return entry
+
+
+def run(sizes, seed=0, repeat=1, verbose=True, engines=False, dynamic=False,
+        wavefront=False):
+    results = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': seed,
+        'sizes': {},
+    }
+    for size in sizes:
+        entry = benchmark_size(size, seed=seed, repeat=repeat)
+        results['sizes'][str(size)] = entry
+        if verbose:
+            print(f"{size}x{size}:")
+            for name, stats in entry.items():
+                print(f"  {name:14s} {stats['time'] * 1000:10.1f} ms "
+                      f"{stats['peak_bytes'] / 1e6:9.1f} MB "
+                      f"{stats['cells_per_second'] / 1e6:7.2f} Mcells/s")
+        if engines:
+            entry = benchmark_engines(size, seed=seed, repeat=repeat)
+            results.setdefault('engines', {})[str(size)] = entry
+            if verbose:
+                print(f"{size}x{size} engines:")
+                for name, stats in entry.items():
+                    print(f"  {name:14s} {stats['time'] * 1000:10.1f} ms "
+                          f"{stats['cells_per_second'] / 1e6:7.2f} Mcells/s "
+                          f"{stats['dead_ends']:9d} dead ends "
+                          f"{stats['solution_length']:8d} solution")
+        if dynamic:
+            entry = benchmark_dynamic(size, seed=seed)
+            results.setdefault('dynamic', {})[str(size)] = entry
+            if verbose:
+                print(f"{size}x{size} dynamic: initial {entry['initial_time'] * 1000:.1f} ms, "
+                      f"mean tick {entry['mean_tick_time'] * 1000:.2f} ms "
+                      f"vs solve_bfs {entry['mean_bfs_time'] * 1000:.1f} ms "
+                      f"(max {entry['max_tick_time'] * 1000:.1f} ms, "
+                      f"{entry['mean_tick_expanded']:.0f} expanded, "
+                      f"{entry['no_route_ticks']}/{entry['ticks']} ticks without a route)")
+        if wavefront:
+            entry = benchmark_wavefront(size, seed=seed, repeat=repeat)
+            results.setdefault('wavefront', {})[str(size)] = entry
+            if verbose:
+                print(f"{size}x{size} wavefront:")
+                for name, stats in entry.items():
+                    print(f"  {name:10s} solve {stats['bfs_time'] * 1000:8.1f} -> "
+                          f"{stats['wavefront_time'] * 1000:8.1f} ms (x{stats['speedup']:.1f})  "
+                          f"field {stats['bfs_field_time'] * 1000:8.1f} -> "
+                          f"{stats['field_time'] * 1000:8.1f} ms (x{stats['field_speedup']:.1f})")
+    return results
+
+
+def compare(current, baseline, threshold=0.10):
+    """List regressions: time or peak memory worse than baseline by > threshold"""
+    regressions = []
+    for size, entry in current['sizes'].items():
+        old_entry = baseline.get('sizes', {}).get(size)
+        if not old_entry:
+            continue
+        for name, stats in entry.items():
+            old = old_entry.get(name)
+            if not old:
+                continue
+            for metric in ('time', 'peak_bytes'):
+                if old[metric] and stats[metric] > old[metric] * (1 + threshold):
+                    regressions.append({
+                        'size': size,
+                        'benchmark': name,
+                        'metric': metric,
+                        'baseline': old[metric],
+                        'current': stats[metric],
+                        'change': stats[metric] / old[metric] - 1,
+                    })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="timed runs per benchmark, the fastest is kept")
+    parser.add_argument('--out', help="write results JSON here")
+    parser.add_argument('--compare', help="baseline results JSON to check against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="allowed slowdown before flagging (default 0.10)")
+    parser.add_argument('--engines', action='store_true',
+                        help="also compare the generation engines")
+    parser.add_argument('--dynamic', action='store_true',
+                        help="also time DynamicSolver repairs against solve_bfs")
+    parser.add_argument('--wavefront', action='store_true',
+                        help="also compare the bitboard wavefront with solve_bfs")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, seed=args.seed, repeat=args.repeat,
+                  engines=args.engines, dynamic=args.dynamic,
+                  wavefront=args.wavefront)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['size']} {r['benchmark']} {r['metric']}: "
+                  f"{r['baseline']:.4g} -> {r['current']:.4g} ({r['change']:+.0%})")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,462 @@
+"""Local HTTP/JSON service for generating, solving and rendering mazes
+
+    python service.py --port 8080 --cache-dir maze-cache
+
+Every endpoint takes GET query parameters or a POST JSON body:
+
+    /generate  width, height, seed, algorithm; rows=1 adds the cells ('1' = wall)
+    /solve     the maze parameters plus solver, start=x,y, end=x,y; path=0
+               leaves out the path
+    /render    the maze parameters plus format=text|png, solver, scale
+    /stats     cache hit counts
+
+A maze is identified by (width, height, seed, algorithm), so it is only
+generated once: mazes are kept in an in-memory LRU and as .maze files in
+the cache directory (also LRU, by file modification time). Solutions are
+cached too. Generation, solving and rendering run in a process pool so the
+event loop keeps serving other requests; concurrent requests for a maze
+that is still being generated wait for the same job.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import http
+import io
+import json
+import multiprocessing
+import os
+import random
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+from Maze import (ENGINES, SOLVERS, MazeGenerator, MazeSolver, export_png, load_maze,
+                  render_maze, save_maze, _ROW_TO_TEXT)
+
+MAX_SIDE = 4001
+
+
+# Mazes kept in each worker process, so solves don't send the grid; set by _worker_init
+_worker_cache = None
+
+
+def _worker_init(directory, max_bytes):
+    global _worker_cache
+    _worker_cache = MazeCache(directory, max_bytes=max_bytes)
+
+
+def _resident(key, maze=None):
+    """The maze for key in this worker, remembering maze if given
+
+    Falls back to the cache directory; None if the worker has no copy.
+    """
+    if _worker_cache is None:
+        return maze
+    if maze is None:
+        maze = _worker_cache.get(key)
+    if maze is None:
+        maze = _worker_cache.load(key)
+    if maze is not None:
+        _worker_cache.remember(key, maze)
+    return maze
+
+
+def generate(key):
+    """Generate the maze for key (width, height, seed, algorithm); runs in a worker"""
+    width, height, seed, algorithm = key
+    generator = MazeGenerator(width, height, rng=random.Random(seed), algorithm=algorithm)
+    maze = generator.generate_maze()
+    maze.seed = seed
+    return _resident(key, maze)
+
+
+def solve(key, name, start, end, maze=None):
+    """Solve the maze for key; runs in a worker
+
+    maze is only passed when the worker doesn't have it yet (None is
+    returned then). Returns (result dict, result as JSON bytes): encoding a
+    long path is slow, so it happens here once rather than on every cached
+    response.
+    """
+    maze = _resident(key, maze)
+    if maze is None:
+        return None
+    solver = MazeSolver(maze, rng=random.Random(key[2]), record_path=False)
+    solver.start, solver.end = start, end
+    solution, _ = solver.solve(name)
+    result = {
+        'solver': name,
+        'start': list(start),
+        'end': list(end),
+        'length': len(solution) if solution else 0,
+        'path': [list(point) for point in solution] if solution else None,
+        'expanded': solver.stats.expanded,
+        'time': solver.stats.elapsed,
+    }
+    return result, json.dumps(result).encode('utf-8')
+
+
+def render(key, fmt, solution, start, end, scale, maze=None):
+    """Render the maze for key as text or PNG bytes; runs in a worker
+
+    As with solve, maze is only passed when the worker doesn't have it yet.
+    """
+    maze = _resident(key, maze)
+    if maze is None:
+        return None
+    if fmt == 'png':
+        out = io.BytesIO()
+        export_png(maze, out, solution_path=solution, start=start, end=end, scale=scale)
+        return out.getvalue()
+    out = io.StringIO()
+    render_maze(maze, out, solution_path=solution, start=start, end=end)
+    return out.getvalue().encode('utf-8')
+
+
+class MazeCache:
+    """Mazes by (width, height, seed, algorithm): LRU in memory, .maze files on disk
+
+    Memory holds at most `max_bytes` of cells. With a directory, every maze
+    is also saved as <sha256 of the key>.maze; the least recently used files
+    are deleted once they take more than `max_disk_bytes`.
+    """
+
+    def __init__(self, directory=None, max_bytes=256 * 1024 * 1024,
+                 max_disk_bytes=1024 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def filename(self, key):
+        digest = hashlib.sha256(json.dumps(list(key)).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:32] + '.maze')
+
+    def get(self, key):
+        """Maze from memory, or None"""
+        maze = self.memory.get(key)
+        if maze is not None:
+            self.memory.move_to_end(key)
+        return maze
+
+    def load(self, key):
+        """Maze from disk (marking the file as recently used), or None"""
+        if not self.directory:
+            return None
+        filename = self.filename(key)
+        try:
+            maze = load_maze(filename)
+            os.utime(filename)
+        except (OSError, ValueError):
+            return None
+        return maze
+
+    def remember(self, key, maze):
+        """Keep maze in memory, evicting least recently used ones"""
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return
+        self.memory[key] = maze
+        self.memory_bytes += maze.nbytes
+        while self.memory_bytes > self.max_bytes and len(self.memory) > 1:
+            _, old = self.memory.popitem(last=False)
+            self.memory_bytes -= old.nbytes
+
+    def save(self, key, maze):
+        """Write maze to disk (atomically), then trim the directory"""
+        if not self.directory:
+            return
+        filename = self.filename(key)
+        save_maze(maze, filename + '.tmp')
+        os.replace(filename + '.tmp', filename)
+
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.maze'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # Already trimmed by a concurrent save
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes or path == filename:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Gone already, which is all we wanted
+            total -= size
+
+
+class MazeService:
+    """The HTTP/JSON front end: request parsing, caching and the worker pool"""
+
+    def __init__(self, cache, workers=None, max_solutions=1024,
+                 worker_bytes=64 * 1024 * 1024):
+        self.cache = cache
+        # Workers start lazily while the server runs; forked ones would inherit
+        # the listening socket and every open connection
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods
+                                              else 'spawn')
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                        initializer=_worker_init,
+                                        initargs=(cache.directory, worker_bytes))
+        self.pending = {}  # maze or solution key -> task producing it
+        self.solutions = OrderedDict()
+        self.max_solutions = max_solutions
+        self.counters = {'requests': 0, 'memory_hits': 0, 'disk_hits': 0,
+                         'generated': 0, 'solution_hits': 0}
+        self.routes = {
+            '/generate': self.generate,
+            '/solve': self.solve,
+            '/render': self.render,
+            '/stats': self.stats,
+        }
+
+    def _once(self, key, make):
+        """Await the job for key, starting make() only if none is running
+
+        Concurrent requests for the same maze or solution share one job.
+        """
+        task = self.pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(make())
+            self.pending[key] = task
+            task.add_done_callback(lambda _: self.pending.pop(key, None))
+        return task
+
+    async def maze(self, key):
+        """The maze for key from memory, disk or a worker, in that order"""
+        maze = self.cache.get(key)
+        if maze is not None:
+            self.counters['memory_hits'] += 1
+            return maze
+        return await self._once(key, lambda: self._fetch(key))
+
+    async def _fetch(self, key):
+        loop = asyncio.get_running_loop()
+        maze = await loop.run_in_executor(None, self.cache.load, key)
+        if maze is not None:
+            self.counters['disk_hits'] += 1
+        else:
+            maze = await loop.run_in_executor(self.pool, generate, key)
+            self.counters['generated'] += 1
+            await loop.run_in_executor(None, self.cache.save, key, maze)
+        self.cache.remember(key, maze)
+        return maze
+
+    async def _solution(self, key, maze, params):
+        """(result dict, its JSON bytes) for the solve asked for in params"""
+        solver = params.get('solver', 'bfs')
+        if solver not in SOLVERS:
+            raise ValueError(f"solver must be one of {', '.join(SOLVERS)}")
+        start = _point(params.get('start'), (1, 1), maze)
+        end = _point(params.get('end'), (maze.width - 2, maze.height - 2), maze)
+
+        cache_key = (key, solver, start, end)
+        cached = self.solutions.get(cache_key)
+        if cached is not None:
+            self.solutions.move_to_end(cache_key)
+            self.counters['solution_hits'] += 1
+            return cached
+        return await self._once(cache_key, lambda: self._run_solve(cache_key, maze))
+
+    async def _run_solve(self, cache_key, maze):
+        key, solver, start, end = cache_key
+        cached = await self._in_worker(solve, key, maze, solver, start, end)
+        self.solutions[cache_key] = cached
+        if len(self.solutions) > self.max_solutions:
+            self.solutions.popitem(last=False)
+        return cached
+
+    async def _in_worker(self, func, key, maze, *args):
+        """func(key, *args) in the pool, sending maze only to a worker without it"""
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self.pool, func, key, *args)
+        if result is None:
+            result = await loop.run_in_executor(self.pool, func, key, *args, maze)
+        return result
+
+    async def generate(self, params):
+        key = _maze_key(params)
+        maze = await self.maze(key)
+        result = {'width': maze.width, 'height': maze.height,
+                  'seed': key[2], 'algorithm': key[3]}
+        if _flag(params.get('rows', 0)):
+            result['rows'] = [bytes(row).translate(_ROW_TO_TEXT).decode('ascii')
+                              for row in maze]
+        return 200, 'application/json', result
+
+    async def solve(self, params):
+        key = _maze_key(params)
+        maze = await self.maze(key)
+        result, payload = await self._solution(key, maze, params)
+        if not _flag(params.get('path', 1)):
+            # Everything but the path; small, so encoding it each time is cheap
+            return 200, 'application/json', {k: v for k, v in result.items() if k != 'path'}
+        return 200, 'application/json', payload
+
+    async def render(self, params):
+        key = _maze_key(params)
+        maze = await self.maze(key)
+        fmt = params.get('format', 'text')
+        if fmt not in ('text', 'png'):
+            raise ValueError("format must be text or png")
+        scale = int(params.get('scale', 1))
+        if not 1 <= scale <= 16:
+            raise ValueError("scale must be between 1 and 16")
+
+        solution, start, end = None, None, None
+        if params.get('solver'):
+            result, _ = await self._solution(key, maze, params)
+            solution = result['path'] and [tuple(point) for point in result['path']]
+            start, end = tuple(result['start']), tuple(result['end'])
+        body = await self._in_worker(render, key, maze, fmt, solution, start, end, scale)
+        return 200, 'image/png' if fmt == 'png' else 'text/plain; charset=utf-8', body
+
+    async def stats(self, params):
+        result = dict(self.counters)
+        result['cached_mazes'] = len(self.cache.memory)
+        result['cached_bytes'] = self.cache.memory_bytes
+        result['cached_solutions'] = len(self.solutions)
+        return 200, 'application/json', result
+
+    async def respond(self, method, target, body):
+        """Run one request; returns (status, content type, body bytes)"""
+        self.counters['requests'] += 1
+        url = urlsplit(target)
+        handler = self.routes.get(url.path)
+        try:
+            if handler is None:
+                return _error(404, f"no such endpoint {url.path}")
+            if method not in ('GET', 'POST'):
+                return _error(405, "use GET or POST")
+            params = dict(parse_qsl(url.query))
+            if body:
+                data = json.loads(body)
+                if not isinstance(data, dict):
+                    raise ValueError("request body must be a JSON object")
+                params.update(data)
+            status, content_type, result = await handler(params)
+        except (ValueError, TypeError) as e:
+            return _error(400, str(e))
+        except Exception as e:
+            return _error(500, f"{type(e).__name__}: {e}")
+        if content_type == 'application/json' and not isinstance(result, bytes):
+            result = json.dumps(result).encode('utf-8')
+        return status, content_type, result
+
+    async def handle(self, reader, writer):
+        """Serve one connection (HTTP/1.1 with keep-alive)"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                method, target, version = line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                status, content_type, payload = await self.respond(method, target, body)
+                keep_alive = (version == 'HTTP/1.1' and
+                              headers.get('connection', '').lower() != 'close')
+                writer.write(
+                    f"HTTP/1.1 {status} {http.HTTPStatus(status).phrase}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                    f"\r\n".encode('latin-1') + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8080):
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.pool.shutdown()
+
+
+def _maze_key(params):
+    """(width, height, seed, algorithm) from request parameters"""
+    width = int(params.get('width', 21))
+    height = int(params.get('height', width))
+    if not (3 <= width <= MAX_SIDE and 3 <= height <= MAX_SIDE):
+        raise ValueError(f"width and height must be between 3 and {MAX_SIDE}")
+    # Generators round sizes up to odd, so 20 and 21 are the same maze
+    width, height = width | 1, height | 1
+    seed = str(params.get('seed', 0))
+    algorithm = params.get('algorithm', 'dfs')
+    if algorithm not in ENGINES:
+        raise ValueError(f"algorithm must be one of {', '.join(ENGINES)}")
+    return width, height, seed, algorithm
+
+
+def _point(value, default, maze):
+    """Parse 'x,y' or [x, y] into a point inside the maze"""
+    if value is None or value == '':
+        return default
+    if isinstance(value, str):
+        value = value.split(',')
+    x, y = (int(v) for v in value)
+    if not (0 <= x < maze.width and 0 <= y < maze.height):
+        raise ValueError(f"point {x},{y} is outside the maze")
+    return x, y
+
+
+def _flag(value):
+    """Boolean request parameter: 1/0, true/false (query string or JSON)"""
+    if isinstance(value, str):
+        return value.lower() not in ('', '0', 'false', 'no')
+    return bool(value)
+
+
+def _error(status, message):
+    return status, 'application/json', json.dumps({'error': message}).encode('utf-8')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve maze generation and solving over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--cache-dir', default=None, help="keep generated mazes here too")
+    parser.add_argument('--cache-mb', type=int, default=256, help="in-memory maze cache size")
+    parser.add_argument('--disk-mb', type=int, default=1024, help="on-disk maze cache size")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    cache = MazeCache(args.cache_dir, max_bytes=args.cache_mb * 1024 * 1024,
+                      max_disk_bytes=args.disk_mb * 1024 * 1024)
+    service = MazeService(cache, workers=args.workers)
+    print(f"🧩 Maze service on http://{args.host}:{args.port}/")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,369 @@
+"""Tiled mazes for sizes that don't fit in memory
+
+A tiled maze lives in a directory: one bit-packed .maze file per tile plus
+layout.json. Each tile is an independent perfect maze seeded from
+(seed, tile x, tile y), so tiles can be generated in parallel. Connectivity
+across seams comes from a random spanning tree over the tiles: every tree
+edge opens exactly one door in the wall between two tiles, which keeps the
+whole maze perfect (one path between any two cells).
+
+HierarchicalSolver does HPA*-style search: Dijkstra over an abstract graph
+whose nodes are the doors (edge weights are the door-to-door distances
+inside each tile, computed once at generation time), then refines each hop
+with a BFS inside one tile, loading tiles on demand through a small LRU.
+
+    python tiled.py generate mazedir --size 20001 --tile 500
+    python tiled.py solve mazedir
+"""
+
+import argparse
+import heapq
+import json
+import os
+import random
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from Maze import (MazeGenerator, MazeGrid, MazeSolver, load_maze, save_maze,
+                  _bfs_distances, _to_index, _walled_cells)
+
+LAYOUT_FILE = 'layout.json'
+
+
+def tile_filename(directory, tx, ty):
+    return os.path.join(directory, f"tile_{tx}_{ty}.maze")
+
+
+def _generate_tile(task):
+    """Generate, save and measure one tile; runs in a worker process
+
+    doors holds (door number, global x, global y) for this tile's doors.
+    Returns ((tx, ty), door numbers, [(door i, door j, steps), ...]).
+    """
+    directory, tx, ty, origin, size, seed, doors = task
+    block_w, block_h = size
+    ox, oy = origin
+    generator = MazeGenerator(block_w, block_h,
+                              rng=random.Random(f"{seed}:{tx}:{ty}"))
+    grid = generator.generate_maze()
+    grid.seed = f"{seed}:{tx}:{ty}"
+
+    local = [(number, gx - ox, gy - oy) for number, gx, gy in doors]
+    for _, x, y in local:
+        grid.cells[y * block_w + x] = 0
+    save_maze(grid, tile_filename(directory, tx, ty))
+
+    # Door-to-door distances inside this tile
+    cells, width, pad = _walled_cells(grid, [(x, y) for _, x, y in local])
+    edges = []
+    for i, (a, ax, ay) in enumerate(local):
+        dist, _ = _bfs_distances(cells, width, [_to_index((ax, ay), width, pad)])
+        for b, bx, by in local[i + 1:]:
+            d = dist[_to_index((bx, by), width, pad)]
+            if d >= 0:
+                edges.append((a, b, d))
+    return (tx, ty), [number for number, _, _ in local], edges
+
+
+class TiledMaze:
+    """A maze stored as a directory of tiles, loaded on demand"""
+
+    def __init__(self, directory, cache_tiles=16):
+        self.directory = directory
+        with open(os.path.join(directory, LAYOUT_FILE)) as f:
+            layout = json.load(f)
+        self.width = layout['width']
+        self.height = layout['height']
+        self.tile = layout['tile']
+        self.seed = layout['seed']
+        self.tiles_x = layout['tiles_x']
+        self.tiles_y = layout['tiles_y']
+        self.doors = [tuple(door) for door in layout['doors']]
+        self.tile_doors = {tuple(map(int, key.split(','))): numbers
+                           for key, numbers in layout['tile_doors'].items()}
+        self.door_edges = [tuple(edge) for edge in layout['door_edges']]
+        self.cache_tiles = cache_tiles
+        self._tiles = OrderedDict()
+
+    @classmethod
+    def generate(cls, directory, width, height, tile=256, seed=0, workers=None,
+                 cache_tiles=16):
+        """Generate a tiled maze into `directory` and open it
+
+        width and height are grid sizes like MazeGenerator's (made odd);
+        tile is the tile side in maze cells (a block of 2 * tile + 1 grid
+        cells). Tiles are generated across a process pool.
+        """
+        width += width % 2 == 0
+        height += height % 2 == 0
+        cols, rows = (width - 1) // 2, (height - 1) // 2
+        tiles_x = -(-cols // tile)
+        tiles_y = -(-rows // tile)
+        rng = random.Random(f"{seed}:layout")
+
+        # Random spanning tree over the tiles (Kruskal with union-find);
+        # every tree edge gets one door at a random spot on its seam
+        parent = list(range(tiles_x * tiles_y))
+
+        def find(n):
+            while parent[n] != n:
+                parent[n] = parent[parent[n]]
+                n = parent[n]
+            return n
+
+        seams = []
+        for ty in range(tiles_y):
+            for tx in range(tiles_x):
+                if tx + 1 < tiles_x:
+                    seams.append((tx, ty, 1, 0))
+                if ty + 1 < tiles_y:
+                    seams.append((tx, ty, 0, 1))
+        rng.shuffle(seams)
+
+        doors = []
+        tile_doors = {}  # (tx, ty) -> door numbers on its border
+        for tx, ty, dx, dy in seams:
+            a, b = find(ty * tiles_x + tx), find((ty + dy) * tiles_x + tx + dx)
+            if a == b:
+                continue
+            parent[a] = b
+            tile_doors.setdefault((tx, ty), []).append(len(doors))
+            tile_doors.setdefault((tx + dx, ty + dy), []).append(len(doors))
+            if dx:
+                span = min(tile, rows - ty * tile)
+                doors.append((2 * (tx + 1) * tile, 2 * (ty * tile + rng.randrange(span)) + 1))
+            else:
+                span = min(tile, cols - tx * tile)
+                doors.append((2 * (tx * tile + rng.randrange(span)) + 1, 2 * (ty + 1) * tile))
+
+        os.makedirs(directory, exist_ok=True)
+        tasks = []
+        for ty in range(tiles_y):
+            for tx in range(tiles_x):
+                origin = (2 * tx * tile, 2 * ty * tile)
+                size = (2 * min(tile, cols - tx * tile) + 1,
+                        2 * min(tile, rows - ty * tile) + 1)
+                own = [(n,) + doors[n] for n in tile_doors.get((tx, ty), [])]
+                tasks.append((directory, tx, ty, origin, size, seed, own))
+
+        if workers == 1:
+            results = [_generate_tile(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_generate_tile, tasks))
+
+        door_edges = []
+        for _, _, edges in results:
+            door_edges.extend(edges)
+
+        layout = {
+            'width': width,
+            'height': height,
+            'tile': tile,
+            'seed': seed,
+            'tiles_x': tiles_x,
+            'tiles_y': tiles_y,
+            'doors': doors,
+            'tile_doors': {f"{tx},{ty}": numbers
+                           for (tx, ty), numbers in tile_doors.items()},
+            'door_edges': door_edges,
+        }
+        with open(os.path.join(directory, LAYOUT_FILE), 'w') as f:
+            json.dump(layout, f)
+        return cls(directory, cache_tiles=cache_tiles)
+
+    def tile_of(self, x, y):
+        """Tile holding grid cell (x, y); seam cells go to the right/lower tile"""
+        span = 2 * self.tile
+        return min(x // span, self.tiles_x - 1), min(y // span, self.tiles_y - 1)
+
+    def origin(self, tx, ty):
+        return 2 * tx * self.tile, 2 * ty * self.tile
+
+    def load_tile(self, tx, ty):
+        """Tile grid from disk, through an LRU of `cache_tiles` tiles"""
+        key = (tx, ty)
+        grid = self._tiles.get(key)
+        if grid is not None:
+            self._tiles.move_to_end(key)
+            return grid
+        grid = load_maze(tile_filename(self.directory, tx, ty))
+        self._tiles[key] = grid
+        if len(self._tiles) > self.cache_tiles:
+            self._tiles.popitem(last=False)
+        return grid
+
+    def is_open(self, x, y):
+        tx, ty = self.tile_of(x, y)
+        ox, oy = self.origin(tx, ty)
+        return self.load_tile(tx, ty).is_open(x - ox, y - oy)
+
+    def to_grid(self):
+        """Assemble the whole maze into one MazeGrid (only for sizes that fit)"""
+        grid = MazeGrid(self.width, self.height)
+        grid.seed = self.seed
+        grid.algorithm = 'tiled-dfs'
+        for ty in range(self.tiles_y):
+            for tx in range(self.tiles_x):
+                tile = load_maze(tile_filename(self.directory, tx, ty))
+                ox, oy = self.origin(tx, ty)
+                # Neighbouring tiles share their seam rows/columns, which
+                # hold the same walls and doors in both tiles
+                for y in range(tile.height):
+                    start = (oy + y) * self.width + ox
+                    grid.cells[start:start + tile.width] = \
+                        tile.cells[y * tile.width:(y + 1) * tile.width]
+        return grid
+
+
+class HierarchicalSolver:
+    """HPA*-style shortest paths on a TiledMaze
+
+    Only the tiles along the route are loaded: the source and target tiles
+    for the first and last hops, then one tile per door-to-door hop.
+    """
+
+    def __init__(self, tiled):
+        self.tiled = tiled
+        self.start = (1, 1)
+        self.end = (tiled.width - 2, tiled.height - 2)
+        # Abstract graph: door -> [(door, steps)]
+        self.adjacency = adjacency = {}
+        for a, b, d in tiled.door_edges:
+            adjacency.setdefault(a, []).append((b, d))
+            adjacency.setdefault(b, []).append((a, d))
+        # door -> tiles it belongs to (two, one on each side of its seam)
+        self.door_tiles = {}
+        for key, numbers in tiled.tile_doors.items():
+            for number in numbers:
+                self.door_tiles.setdefault(number, []).append(key)
+
+    def _local(self, key, point):
+        ox, oy = self.tiled.origin(*key)
+        return point[0] - ox, point[1] - oy
+
+    def _tile_distances(self, key, point):
+        """BFS distances inside one tile from point to every door of the tile"""
+        grid = self.tiled.load_tile(*key)
+        local = self._local(key, point)
+        doors = [(n, self._local(key, self.tiled.doors[n]))
+                 for n in self.tiled.tile_doors.get(key, [])]
+        cells, width, pad = _walled_cells(grid, [local] + [p for _, p in doors])
+        dist, _ = _bfs_distances(cells, width, [_to_index(local, width, pad)])
+        found = []
+        for n, p in doors:
+            d = dist[_to_index(p, width, pad)]
+            if d >= 0:
+                found.append((n, d))
+        return found
+
+    def _tile_path(self, key, a, b):
+        """Cell path from a to b inside one tile, in global coordinates"""
+        grid = self.tiled.load_tile(*key)
+        solver = MazeSolver(grid)
+        solver.start = self._local(key, a)
+        solver.end = self._local(key, b)
+        path, _ = solver.solve_bfs()
+        if path is None:
+            return None
+        ox, oy = self.tiled.origin(*key)
+        return [(x + ox, y + oy) for x, y in path]
+
+    def solve(self, source=None, target=None):
+        """Shortest path from source to target as (x, y) tuples, or None"""
+        tiled = self.tiled
+        source = source or self.start
+        target = target or self.end
+        if not (tiled.is_open(*source) and tiled.is_open(*target)):
+            return None
+        source_tile = tiled.tile_of(*source)
+        target_tile = tiled.tile_of(*target)
+
+        # Abstract search; 'S' and 'T' are the source and target nodes
+        edges = {'S': [(door, d) for door, d in self._tile_distances(source_tile, source)]}
+        to_target = dict(self._tile_distances(target_tile, target))
+        direct = None
+        if source_tile == target_tile:
+            path = self._tile_path(source_tile, source, target)
+            if path is not None:
+                direct = len(path) - 1
+
+        dist = {'S': 0}
+        parent = {'S': None}
+        heap = [(0, 0, 'S')]
+        best, best_door = direct, None
+        counter = 1
+        while heap:
+            d, _, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            if best is not None and d >= best:
+                break
+            if node in to_target:
+                total = d + to_target[node]
+                if best is None or total < best:
+                    best, best_door = total, node
+            for nbr, steps in edges.get(node, self.adjacency.get(node, [])):
+                nd = d + steps
+                if nbr not in dist or nd < dist[nbr]:
+                    dist[nbr] = nd
+                    parent[nbr] = node
+                    heapq.heappush(heap, (nd, counter, nbr))
+                    counter += 1
+
+        if best is None:
+            return None
+        if best_door is None:
+            return self._tile_path(source_tile, source, target)
+
+        # Refine: door chain back to the source, then one tile BFS per hop
+        chain = [best_door]
+        while parent[chain[-1]] != 'S':
+            chain.append(parent[chain[-1]])
+        chain.reverse()
+        points = [source] + [tiled.doors[n] for n in chain] + [target]
+        tiles = [source_tile]
+        for a, b in zip(chain, chain[1:]):
+            shared = set(self.door_tiles[a]) & set(self.door_tiles[b])
+            tiles.append(min(shared))
+        tiles.append(target_tile)
+
+        path = [source]
+        for key, a, b in zip(tiles, points, points[1:]):
+            hop = self._tile_path(key, a, b)
+            if hop is None:
+                return None
+            path.extend(hop[1:])
+        return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate and solve tiled mazes")
+    commands = parser.add_subparsers(dest='command', required=True)
+    generate = commands.add_parser('generate', help="generate a tiled maze")
+    generate.add_argument('directory')
+    generate.add_argument('--size', type=int, default=2001, help="grid size N (N x N)")
+    generate.add_argument('--tile', type=int, default=256, help="tile side in maze cells")
+    generate.add_argument('--seed', type=int, default=0)
+    generate.add_argument('--workers', type=int, default=None)
+    solve = commands.add_parser('solve', help="solve corner to corner")
+    solve.add_argument('directory')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.command == 'generate':
+        tiled = TiledMaze.generate(args.directory, args.size, args.size, tile=args.tile,
+                                   seed=args.seed, workers=args.workers)
+        print(f"Generated {tiled.tiles_x}x{tiled.tiles_y} tiles "
+              f"in {time.perf_counter() - start:.2f}s")
+    else:
+        path = HierarchicalSolver(TiledMaze(args.directory)).solve()
+        print(f"Solution: {len(path) if path else 0} steps "
+              f"in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
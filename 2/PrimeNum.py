@@ -1,14 +1,261 @@
-n=int(input())
-if(n==0 or n==1):
-    print("Not Prime")
-    exit()
-    
-is_prime=False
-for i in range(2, n):
-    if(n%i==0):
-        print("Not Prime")
-        is_prime=True
-        break
-
-if(is_prime==False):
-    print("Prime") 
\ No newline at end of file
+"""Prime numbers: primality tests, a segmented sieve and batch queries
+
+- is_prime(n): deterministic Miller-Rabin for every n below 3.1 * 10**23
+  (so all 64-bit integers); a strong probable-prime test above that.
+- iter_primes(stop, start) / count_primes(stop, start): segmented Sieve of
+  Eratosthenes. Only odd numbers are stored, one byte each, and only one
+  segment at a time per worker, so memory stays around segment_size
+  bytes per worker however large stop is (10**10 and beyond). Segments
+  run on a process pool and come back in order.
+- check_stream(infile, outfile): answers one query per whitespace-separated
+  integer, for files or stdin with millions of numbers.
+
+    python PrimeNum.py                      (type one number, as before)
+    python PrimeNum.py check numbers.txt    (or - for stdin)
+    python PrimeNum.py primes 1000000 1000100
+    python PrimeNum.py primes 10000000000 --count --workers 8
+"""
+
+import argparse
+import os
+import sys
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import compress
+from math import isqrt
+
+# Odd numbers (bytes) sieved per segment
+SEGMENT_SIZE = 1 << 23
+
+# Batch queries below this are answered from one shared sieve table
+LOOKUP_LIMIT = 1 << 24
+
+_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+# (bound, bases): Miller-Rabin with these bases is exact for n < bound
+_WITNESS_TIERS = (
+    (2047, (2,)),
+    (1373653, (2, 3)),
+    (25326001, (2, 3, 5)),
+    (3215031751, (2, 3, 5, 7)),
+    (2152302898747, (2, 3, 5, 7, 11)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+    (341550071728321, (2, 3, 5, 7, 11, 13, 17)),
+    (3825123056546413051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (318665857834031151167461, _WITNESSES),
+)
+
+
+def is_prime(n):
+    """True if n is prime; exact for n < 3.1 * 10**23"""
+    if n < 2:
+        return False
+    for p in _WITNESSES:
+        if n % p == 0:
+            return n == p
+    if n < 41 * 41:
+        return True
+
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    bases = _WITNESSES
+    for bound, tier in _WITNESS_TIERS:
+        if n < bound:
+            bases = tier
+            break
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def small_primes(limit):
+    """All primes <= limit as an array('I'), from one odd-only sieve"""
+    if limit < 2:
+        return array('I')
+    flags = bytearray([1]) * ((limit + 1) // 2)
+    flags[0] = 0
+    for i in range(1, (isqrt(limit) + 1) // 2):
+        if flags[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            flags[start::p] = bytes(len(range(start, len(flags), p)))
+    primes = array('I', [2])
+    primes.extend(compress(range(1, limit + 1, 2), flags))
+    return primes
+
+
+def sieve_segment(low, high, base):
+    """Prime flags for the odd numbers in [low, high); flags[i] is for low + 2*i
+
+    low must be odd. base holds the odd primes up to at least isqrt(high - 1).
+    """
+    size = (high - low + 1) // 2
+    flags = bytearray([1]) * size
+    zeros = bytes(size // 3 + 1)
+    for p in base:
+        square = p * p
+        if square >= high:
+            break
+        first = max(square, (low + p - 1) // p * p)
+        if first % 2 == 0:
+            first += p
+        index = (first - low) // 2
+        if index < size:
+            count = (size - 1 - index) // p + 1
+            flags[index::p] = zeros[:count]
+    if low == 1:
+        flags[0] = 0
+    return flags
+
+
+def _segment_primes(task):
+    """Primes in [low, high) as an array('Q'); runs in a worker process"""
+    low, high, base = task
+    primes = array('Q', [2] if low <= 2 < high else [])
+    low |= 1
+    if low < high:
+        primes.extend(compress(range(low, high, 2), sieve_segment(low, high, base)))
+    return primes
+
+
+def _segment_count(task):
+    """Number of primes in [low, high); runs in a worker process"""
+    low, high, base = task
+    count = 1 if low <= 2 < high else 0
+    low |= 1
+    if low < high:
+        count += sieve_segment(low, high, base).count(1)
+    return count
+
+
+def _segments(start, stop, segment_size):
+    """Tasks (low, high, base primes) covering [start, stop)"""
+    base = small_primes(isqrt(max(stop - 1, 0)))[1:]
+    span = 2 * segment_size
+    for low in range(max(start, 0), stop, span):
+        yield low, min(low + span, stop), base
+
+
+def _ordered_map(func, tasks, workers):
+    """map(func, tasks) across a process pool, in order, a few tasks ahead
+
+    Only about 2 * workers results are ever waiting, so enumerating huge
+    ranges doesn't pile results up in memory.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(func, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(func, task))
+            if len(pending) > 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_primes(stop, start=2, workers=None, segment_size=SEGMENT_SIZE):
+    """Yield the primes in [start, stop) in increasing order
+
+    workers defaults to all cores; ranges of one segment run in this process.
+    """
+    if stop - start <= 2 * segment_size:
+        workers = 1
+    for primes in _ordered_map(_segment_primes, _segments(start, stop, segment_size), workers):
+        yield from primes
+
+
+def count_primes(stop, start=2, workers=None, segment_size=SEGMENT_SIZE):
+    """Number of primes in [start, stop), without keeping any of them"""
+    if stop - start <= 2 * segment_size:
+        workers = 1
+    return sum(_ordered_map(_segment_count, _segments(start, stop, segment_size), workers))
+
+
+@lru_cache(maxsize=1)
+def _lookup_table():
+    """Odd-only sieve flags below LOOKUP_LIMIT, built on first use"""
+    return sieve_segment(1, LOOKUP_LIMIT, small_primes(isqrt(LOOKUP_LIMIT))[1:])
+
+
+def check_numbers(numbers):
+    """Yield (n, is_prime(n)) for each n; small ones come from a shared sieve table"""
+    table = None
+    for n in numbers:
+        if 2 < n < LOOKUP_LIMIT:
+            if table is None:
+                table = _lookup_table()
+            yield n, n & 1 == 1 and table[n >> 1] == 1
+        else:
+            yield n, is_prime(n)
+
+
+def check_stream(infile, outfile):
+    """Write 'n Prime' or 'n Not Prime' for every integer in a text file object"""
+    numbers = (int(token) for line in infile for token in line.split())
+    batch = []
+    for n, prime in check_numbers(numbers):
+        batch.append(f"{n} Prime\n" if prime else f"{n} Not Prime\n")
+        if len(batch) >= 65536:
+            outfile.write(''.join(batch))
+            batch.clear()
+    outfile.write(''.join(batch))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="PrimeNum.py", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest='command')
+    check = sub.add_parser('check', help="test every integer in a file (or - for stdin)")
+    check.add_argument('source', nargs='?', default='-')
+    primes = sub.add_parser('primes', help="list or count the primes in [START, STOP)")
+    primes.add_argument('bounds', type=int, nargs='+', metavar='START STOP',
+                        help="STOP, or START STOP")
+    primes.add_argument('--count', action='store_true', help="only print how many")
+    primes.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: all cores)")
+    primes.add_argument('--segment-size', type=int, default=SEGMENT_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        # The original single question
+        print("Prime" if is_prime(int(input())) else "Not Prime")
+    elif args.command == 'check':
+        if args.source == '-':
+            check_stream(sys.stdin, sys.stdout)
+        else:
+            with open(args.source) as f:
+                check_stream(f, sys.stdout)
+    else:
+        if len(args.bounds) > 2:
+            parser.error("primes takes STOP or START STOP")
+        start, stop = args.bounds if len(args.bounds) == 2 else (2, args.bounds[0])
+        if args.count:
+            print(count_primes(stop, start, args.workers, args.segment_size))
+        else:
+            out = sys.stdout
+            batch = []
+            for p in iter_primes(stop, start, args.workers, args.segment_size):
+                batch.append(str(p))
+                if len(batch) >= 65536:
+                    out.write('\n'.join(batch) + '\n')
+                    batch.clear()
+            if batch:
+                out.write('\n'.join(batch) + '\n')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
+from Sort import dedupe
+
 lst=list(map(int, input().split()))
 
-for i in range(len(lst)):
-    if i in lst[i:]:
-        lst.remove(lst[i])
-print(lst)
\ No newline at end of file
+# First occurrence of each number, in order
+print(list(dedupe(lst)))
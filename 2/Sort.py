@@ -1,9 +1,238 @@
-lst=list(map(int, input().split()))
+"""Sort and dedupe integer streams of any size
 
-n=len(lst)
-for i in range(n):
-    for j in range(0, n-i-1):
-        if(lst[j] > lst[j+1]):
-            lst[j], lst[j+1] = lst[j+1], lst[j]
+- sort_ints(values): values are buffered in an array('q') (8 bytes each).
+  If they all fit in one run of run_size they are sorted in memory;
+  otherwise each full run is sorted and spilled to a temporary file. Every
+  64 runs are merged into one as they pile up, so few files are open at
+  once however long the input is; the rest are merged as the result is read.
+- dedupe(values): keeps the first occurrence of every value, in order,
+  streaming. Values seen so far are kept in a set until it holds run_size
+  of them; past that, the rest of the stream is deduped by sorting
+  (value, position) pairs on disk, keeping the first position of each
+  value and sorting those back into stream order. Memory stays bounded
+  either way.
 
-print(lst)
\ No newline at end of file
+Values are 64-bit signed integers. Text input is whitespace-separated
+integers, read in blocks (a single huge line is fine).
+
+    python Sort.py                        (type one line of numbers, as before)
+    python Sort.py sort numbers.txt sorted.txt [--unique]
+    python Sort.py dedupe numbers.txt - --run-size 1000000
+"""
+
+import argparse
+import heapq
+import sys
+import tempfile
+from array import array
+from itertools import groupby, islice
+
+# Values sorted in memory at a time (and set size for dedupe) before spilling
+RUN_SIZE = 1 << 20
+
+# Runs merged in one pass, and values read per run at a time while merging
+MERGE_WIDTH = 64
+READ_BLOCK = 1 << 14
+
+# (a, b) pairs of 64-bit values are sorted as the one int a << 64 | (b + _OFFSET)
+_OFFSET = 1 << 63
+_LOW = (1 << 64) - 1
+
+
+def read_ints(infile, block_size=1 << 20):
+    """Yield the whitespace-separated integers of a text file object, block by block"""
+    pending = ''
+    while True:
+        block = infile.read(block_size)
+        if not block:
+            break
+        block = pending + block
+        # The last token may continue in the next block
+        cut = len(block)
+        while cut and not block[cut - 1].isspace():
+            cut -= 1
+        pending = block[cut:]
+        yield from map(int, block[:cut].split())
+    if pending.strip():
+        yield from map(int, pending.split())
+
+
+def write_ints(values, outfile, batch_size=65536):
+    """Write one integer per line"""
+    while True:
+        batch = list(islice(values, batch_size))
+        if not batch:
+            break
+        outfile.write('\n'.join(map(str, batch)) + '\n')
+
+
+def _spill(keys, pairs, tmpdir):
+    """Write sorted keys to a temporary file as int64 records; return the file
+
+    keys may be a merge of other runs, so they are written a block at a time.
+    """
+    keys = iter(keys)
+    run = tempfile.TemporaryFile(dir=tmpdir)
+    while True:
+        block = list(islice(keys, READ_BLOCK))
+        if not block:
+            break
+        if pairs:
+            data = array('q')
+            for key in block:
+                data.append(key >> 64)
+                data.append((key & _LOW) - _OFFSET)
+        else:
+            data = array('q', block)
+        data.tofile(run)
+    run.seek(0)
+    return run
+
+
+def _read_run(run, pairs):
+    """Yield the keys stored in a run file, READ_BLOCK records at a time"""
+    width = 2 if pairs else 1
+    try:
+        while True:
+            data = array('q')
+            try:
+                data.fromfile(run, READ_BLOCK * width)
+            except EOFError:
+                pass
+            if not data:
+                break
+            if pairs:
+                yield from ((a << 64) | (b + _OFFSET) for a, b in zip(data[::2], data[1::2]))
+            else:
+                yield from data
+    finally:
+        run.close()
+
+
+def _merge_runs(runs, pairs, tmpdir):
+    """Merge run files into one new run file (closing them)"""
+    return _spill(heapq.merge(*(_read_run(run, pairs) for run in runs)), pairs, tmpdir)
+
+
+def _external_sort(keys, pairs=False, run_size=RUN_SIZE, tmpdir=None):
+    """Yield keys in order, spilling sorted runs of run_size to disk when needed
+
+    With pairs, keys are (a, b) pairs packed as a << 64 | (b + _OFFSET).
+    """
+    if run_size < 1:
+        raise ValueError(f"run_size must be at least 1, not {run_size}")
+    keys = iter(keys)
+    # levels[i] holds runs made of MERGE_WIDTH**i spilled buffers. A level
+    # that fills up is merged into one run of the next, so the number of
+    # open files grows with the log of the input size, not the input size
+    levels = [[]]
+    while True:
+        if pairs:
+            buffer = list(islice(keys, run_size))
+        else:
+            buffer = array('q', islice(keys, run_size))
+        if not levels[0] and len(levels) == 1 and len(buffer) < run_size:
+            # Everything fits in one run: no files at all
+            yield from sorted(buffer)
+            return
+        if not buffer:
+            break
+        levels[0].append(_spill(sorted(buffer), pairs, tmpdir))
+        del buffer
+        level = 0
+        while len(levels[level]) >= MERGE_WIDTH:
+            if level + 1 == len(levels):
+                levels.append([])
+            levels[level + 1].append(_merge_runs(levels[level], pairs, tmpdir))
+            levels[level] = []
+            level += 1
+
+    runs = [run for level in reversed(levels) for run in level]
+    while len(runs) > MERGE_WIDTH:
+        # Too many files to merge at once: merge them in groups first
+        runs = [_merge_runs(runs[i:i + MERGE_WIDTH], pairs, tmpdir)
+                for i in range(0, len(runs), MERGE_WIDTH)]
+    yield from heapq.merge(*(_read_run(run, pairs) for run in runs))
+
+
+def sort_ints(values, unique=False, run_size=RUN_SIZE, tmpdir=None):
+    """Yield values (64-bit integers) in increasing order; with unique, each once"""
+    ordered = _external_sort(values, run_size=run_size, tmpdir=tmpdir)
+    if unique:
+        return (value for value, _ in groupby(ordered))
+    return ordered
+
+
+def dedupe(values, run_size=RUN_SIZE, tmpdir=None):
+    """Yield the first occurrence of each value, in the order they arrive"""
+    if run_size < 1:
+        raise ValueError(f"run_size must be at least 1, not {run_size}")
+    values = iter(values)
+    seen = set()
+    for value in values:
+        if value not in seen:
+            seen.add(value)
+            yield value
+            if len(seen) >= run_size:
+                break
+    else:
+        return
+
+    # The set is full: sort (value, position) pairs of everything not yet seen
+    rest = ((value << 64) | (position + _OFFSET)
+            for position, value in enumerate(values) if value not in seen)
+    by_value = _external_sort(rest, pairs=True, run_size=run_size, tmpdir=tmpdir)
+    firsts = (((key & _LOW) - _OFFSET) << 64 | ((key >> 64) + _OFFSET)
+              for _, group in groupby(by_value, key=lambda key: key >> 64)
+              for key in islice(group, 1))
+    for key in _external_sort(firsts, pairs=True, run_size=run_size, tmpdir=tmpdir):
+        yield (key & _LOW) - _OFFSET
+
+
+def positive_int(text):
+    """argparse type for counts that must be at least 1"""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="Sort.py", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest='command')
+    for name, text in (('sort', "sort the integers in a file"),
+                       ('dedupe', "drop repeated integers, keeping the first of each")):
+        command = sub.add_parser(name, help=text)
+        command.add_argument('source', help="input file, or - for stdin")
+        command.add_argument('target', nargs='?', default='-', help="output file, or - for stdout")
+        command.add_argument('--run-size', type=positive_int, default=RUN_SIZE,
+                             help="values held in memory before spilling to disk")
+        command.add_argument('--tmpdir', help="directory for spill files")
+    sub.choices['sort'].add_argument('--unique', action='store_true', help="print each value once")
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        # The original one-line version: one line fits in memory, and values
+        # needn't fit in 64 bits
+        print(sorted(map(int, input().split())))
+        return 0
+
+    infile = sys.stdin if args.source == '-' else open(args.source)
+    outfile = sys.stdout if args.target == '-' else open(args.target, 'w')
+    try:
+        values = read_ints(infile)
+        if args.command == 'sort':
+            result = sort_ints(values, args.unique, args.run_size, args.tmpdir)
+        else:
+            result = dedupe(values, args.run_size, args.tmpdir)
+        write_ints(result, outfile)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())